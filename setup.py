@@ -17,7 +17,13 @@ setuptools.setup(name='telerivet',
       python_requires='>=2.6',
       install_requires=[
         "requests >= 2.4.0",
+        "futures; python_version < '3'",
       ],
+      extras_require={
+        "async": ["aiohttp >= 3.3"],
+        "fastjson": ["orjson >= 3.0"],
+        "tracing": ["opentelemetry-api >= 1.0"],
+      },
       classifiers=[
         "Programming Language :: Python :: 2",
         "Programming Language :: Python :: 3",
@@ -1,3 +1,11 @@
+import contextlib
+import sys
+import time
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
 
 class API:
     """
@@ -17,12 +25,206 @@ class API:
         Arguments:
           - api_key (Your Telerivet API key; see <https://telerivet.com/dashboard/api>)
               * Required
+          
+          - session (requests.Session)
+              * Session used to send requests. If provided, the connection pool options below are
+                  ignored.
+              * Default: a new session is created when the first request is sent
+          
+          - adapter (requests.adapters.HTTPAdapter)
+              * Transport adapter mounted on the default session. If provided, the connection
+                  pool options below are ignored.
+          
+          - pool_connections (int)
+              * Number of connection pools to cache
+              * Default: 10
+          
+          - pool_maxsize (int)
+              * Maximum number of connections to keep open to the API server. When sending
+                  requests from multiple threads, set this to at least the number of threads so
+                  that connections are reused instead of re-established for each request.
+              * Default: 10
+          
+          - pool_block (bool)
+              * If true, requests will wait for a connection to become available when
+                  `pool_maxsize` connections are in use, instead of opening a new connection that
+                  is discarded after the request
+              * Default: false
+          
+          - tcp_keepalive (int)
+              * If set, enables TCP keep-alive on API connections, sending keep-alive probes after
+                  the connection has been idle for this number of seconds, so that idle
+                  connections in the pool are not silently dropped by firewalls or NAT gateways
+          
+          - session_per_thread (bool)
+              * If true, each thread uses its own session (and connection pool) instead of sharing
+                  one session between all threads. Ignored if `session` is provided.
+              * Default: false
+          
+          - rate_limiter (RateLimiter or float)
+              * Limits the rate of API requests sent by this client handle. If a number is
+                  provided, a RateLimiter is created allowing that number of requests per second.
+                  Requests that would exceed the rate limit wait until they may be sent.
+          
+          - retry_policy (RetryPolicy)
+              * Determines when requests that fail due to network errors or temporary server
+                  errors are automatically retried. If not provided, failed requests are not
+                  retried.
+          
+          - send_journal (SendJournal)
+              * Records the outcome of each request that sends messages with an idempotency key,
+                  so that requests with the same key are not sent again
+          
+          - timeout (float or tuple)
+              * Default timeout in seconds for each API request, either a single number or a
+                  (connect timeout, read timeout) tuple. May be overridden for particular requests
+                  with withTimeout().
+              * Default: 60
+          
+          - json_codec
+              * JSON library used to encode requests and decode responses: 'orjson', 'ujson',
+                  'json', or an object with `encode` and `decode` methods (see JSONCodec)
+              * Default: orjson or ujson if installed, otherwise the standard json module
+          
+          - compression
+              * Content encoding used to compress request bodies, or None to disable compression.
+                  'br' and 'zstd' require the brotli or zstandard module, and should only be used
+                  if the API server accepts that encoding.
+              * Allowed values: gzip, br, zstd
+              * Default: gzip
+          
+          - compression_threshold (int)
+              * Minimum size in bytes of request bodies that are compressed
+              * Default: 400
+          
+          - compression_level (int)
+              * Compression level (for gzip, 0-9, where 1 is fastest and 9 is smallest)
+              * Default: the default level of the compression library
+          
+          - hooks (dict)
+              * Functions called for each API request attempt, as a dict mapping an event name to a
+                  function or a list of functions (see addHook)
+          
+          - metrics (bool or Metrics)
+              * True to collect metrics about API requests, or a Metrics object used to collect them
+              * Default: false
+          
+          - entity_cache (bool or EntityCache)
+              * True to cache responses of requests that retrieve a single object (e.g.
+                  getContactById), or an EntityCache used to cache them (see EntityCache)
+              * Default: false
+          
+          - name_cache (bool or NameCache)
+              * True to cache the objects returned by getOrCreateGroup, getOrCreateLabel and
+                  getOrCreateDataTable by name, or a NameCache used to cache them (see NameCache)
+              * Default: false
+          
+          - response_cache (ResponseCache)
+              * Saves responses of endpoints that return slow-changing metadata in a file, so
+                  they can be reused by later requests and other processes (see ResponseCache)
+          
+          - coalesce_requests (bool)
+              * If true, identical GET requests made concurrently by multiple threads are only sent
+                  once, and all threads receive a copy of the response (see SingleFlight)
+              * Default: false
+          
+          - tracer
+              * True to create OpenTelemetry spans for API requests and cursor pages using the
+                  global tracer provider, or an opentelemetry Tracer (see Tracing)
+              * Default: false
+        
+        The number of bytes of requests and responses before and after
+        compression is available via the `compression_stats` property (see CompressionStats).
+        If metrics are enabled, they are available via the `metrics` property.
+        
+        An API handle may be shared by any number of threads. By default, all
+        threads share one session, which is created only once even if several threads send their
+        first request at the same time, so `pool_maxsize` should be at least the number of threads
+        sending requests concurrently. The `num_requests` counter is updated under a lock.
+        Entity objects (Contact, Message, etc.) are not thread-safe, and should not be modified
+        concurrently from multiple threads.
     """
-    def __init__(self, api_key, api_url = 'https://api.telerivet.com/v1'):
+    def __init__(self, api_key, api_url = 'https://api.telerivet.com/v1', session = None, adapter = None,
+            pool_connections = 10, pool_maxsize = 10, pool_block = False, tcp_keepalive = None,
+            session_per_thread = False, rate_limiter = None, retry_policy = None,
+            send_journal = None, timeout = 60, json_codec = None,
+            compression = 'gzip', compression_threshold = 400, compression_level = None,
+            hooks = None, metrics = None, tracer = None, entity_cache = None,
+            name_cache = None, response_cache = None, coalesce_requests = False):
+        import base64, threading
+
         self.api_key = api_key
         self.api_url = api_url
         self.num_requests = 0
-        self.session = None
+        self.session = session
+        self.adapter = adapter
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.tcp_keepalive = tcp_keepalive
+        self.session_per_thread = session_per_thread and session is None
+        self._lock = threading.Lock()
+        self._thread_local = threading.local()
+
+        # timeouts set by withTimeout() apply to the current thread, or the current asyncio task
+        # if contextvars is available
+        self._timeout_override = contextvars.ContextVar('telerivet_timeout', default = (None, None)) if contextvars is not None else None
+
+        if rate_limiter is not None and not isinstance(rate_limiter, RateLimiter):
+            rate_limiter = RateLimiter(rate_limiter)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.send_journal = send_journal
+        self.timeout = timeout
+        self.json_codec = getJSONCodec(json_codec)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self.compression_stats = CompressionStats()
+
+        self.hooks = {}
+        if hooks is not None:
+            for event, event_hooks in hooks.items():
+                if callable(event_hooks):
+                    event_hooks = [event_hooks]
+                for hook in event_hooks:
+                    self.addHook(event, hook)
+
+        if metrics is True:
+            metrics = Metrics()
+        elif metrics is False:
+            metrics = None
+        self.metrics = metrics
+
+        if entity_cache is True:
+            entity_cache = EntityCache()
+        elif entity_cache is False:
+            entity_cache = None
+        self.entity_cache = entity_cache
+
+        if name_cache is True:
+            name_cache = NameCache()
+        elif name_cache is False:
+            name_cache = None
+        self.name_cache = name_cache
+        self.response_cache = response_cache
+        self.single_flight = SingleFlight(self.json_codec) if coalesce_requests else None
+
+        self.tracing = None
+        if tracer:
+            from .tracing import Tracing
+            self.tracing = Tracing(tracer)
+            self.addHook('before_request', self.tracing.startRequestSpan)
+            self.addHook('after_response', self.tracing.endRequestSpan)
+            self.addHook('on_error', self.tracing.endRequestSpan)
+
+        # headers and settings that are the same for every request are computed only once
+        version_info = sys.version_info
+        self._headers = {
+            "User-Agent": "Telerivet Python Client/%s Python/%s.%s.%s OS/%s" % (API.client_version, version_info[0], version_info[1], version_info[2], sys.platform),
+            "Authorization": "Basic " + base64.b64encode(("%s:" % api_key).encode('utf-8')).decode('ascii'),
+        }
+        self._environment_settings = None
 
     def getProjectById(self, id):
         """
@@ -37,7 +239,7 @@ class API:
             Project
         """
         from .project import Project
-        return Project(self, self.doRequest("GET", self.getBaseApiPath() + "/projects/%s" % (id)))
+        return Project(self, self.doRequest("GET", self.getBaseApiPath() + "/projects/%s" % (id), cache_entity = True))
 
     def initProjectById(self, id):
         """
@@ -102,7 +304,7 @@ class API:
             Organization
         """
         from .organization import Organization
-        return Organization(self, self.doRequest("GET", self.getBaseApiPath() + "/organizations/%s" % (id)))
+        return Organization(self, self.doRequest("GET", self.getBaseApiPath() + "/organizations/%s" % (id), cache_entity = True))
 
     def initOrganizationById(self, id):
         """
@@ -178,50 +380,45 @@ class API:
                 self.encodeParamsRec(key, value, res)
         return res
 
-    def doRequest(self, method, path, params = None):
-        import requests, os, json, sys, zlib
-
+    def prepareRequest(self, method, path, params = None):
         url = self.api_url + path
-
-        if self.session is None:
-            self.session = requests.Session()
-
-        version_info = sys.version_info
-
-        headers = {
-            "User-Agent": "Telerivet Python Client/%s Python/%s.%s.%s OS/%s" % (API.client_version, version_info[0], version_info[1], version_info[2], sys.platform)
-        }
+        headers = self._headers.copy()
         data = None
         query = None
         if method == 'POST' or method == 'PUT':
             headers['Content-Type'] = "application/json"
-            data = json.dumps(params)
-
-            if len(data) >= 400:
-                headers['Content-Encoding'] = 'gzip'
-                data_bytes = bytes(data, 'UTF-8') if version_info[0] >= 3 else data
-                gzip_compress = zlib.compressobj(-1, zlib.DEFLATED, zlib.MAX_WBITS | 16) # add gzip header
-                gzip_data = gzip_compress.compress(data_bytes) + gzip_compress.flush()
-                data = gzip_data
-        else:
-            query = self.getUrlParams(params)
+            data = self.json_codec.encode(params)
+            num_bytes = len(data)
 
-        self.num_requests += 1
+            if self.compression and num_bytes >= self.compression_threshold:
+                headers['Content-Encoding'] = self.compression
+                data = compress(data, self.compression, self.compression_level)
 
-        response = self.session.request(method, url,
-            headers = headers,
-            data = data,
-            params = query,
-            auth = (self.api_key, ''),
-            timeout = 60,
-            verify = True
-        )
+            self.compression_stats.addRequest(num_bytes, len(data))
+        elif params:
+            query = self.getUrlParams(params)
+
+        return url, headers, data, query
 
+    def parseResponse(self, status_code, content):
         try:
-            res = response.json()
+            res = self.json_codec.decode(content)
         except ValueError as e:
-            raise IOError("Unexpected response from Telerivet API (HTTP {}): {}".format(response.status_code, response.content))
+            raise IOError("Unexpected response from Telerivet API (HTTP {}): {}".format(status_code, content))
+
+        return self.checkResponse(res)
+
+    def parseCachedResponse(self, cached_response, path, status_code, content, headers):
+        # reuses the saved response if it was revalidated, or saves the new response
+        if status_code == 304 and cached_response.content is not None:
+            self.response_cache.touch(cached_response.key)
+            return self.json_codec.decode(cached_response.content)
+
+        res = self.parseResponse(status_code, content)
+        self.response_cache.put(cached_response.key, path, content, headers.get('ETag'), headers.get('Last-Modified'))
+        return res
 
+    def checkResponse(self, res):
         if "error" in res:
             error = res['error']
             error_code = error['code']
@@ -235,10 +432,504 @@ class API:
         else:
             return res
 
+    def createSession(self):
+        import requests
+
+        session = requests.Session()
+
+        adapter = self.adapter
+        if adapter is None:
+            pool_options = {
+                'pool_connections': self.pool_connections,
+                'pool_maxsize': self.pool_maxsize,
+                'pool_block': self.pool_block,
+            }
+            if self.tcp_keepalive is not None:
+                from .keepaliveadapter import KeepAliveAdapter
+                adapter = KeepAliveAdapter(self.tcp_keepalive, **pool_options)
+            else:
+                adapter = requests.adapters.HTTPAdapter(**pool_options)
+
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def getSession(self):
+        if self.session_per_thread:
+            session = getattr(self._thread_local, 'session', None)
+            if session is None:
+                session = self._thread_local.session = self.createSession()
+            return session
+
+        session = self.session
+        if session is None:
+            with self._lock:
+                if self.session is None:
+                    self.session = self.createSession()
+                session = self.session
+        return session
+
+    def withTimeout(self, timeout = None, total = None):
+        """
+        Returns a context manager that overrides the timeout for all API requests made by the
+        current thread (or asyncio task) within a `with` block, e.g.:
+        
+            with tr.withTimeout(2):
+                contact = project.getContactById(contact_id)
+        
+        Arguments:
+          - timeout (float or tuple)
+              * Timeout in seconds for each API request, either a single number or a
+                  (connect timeout, read timeout) tuple
+          
+          - total (float)
+              * Maximum number of seconds for all API requests within the block, including
+                  retries and fetching multiple pages of results. If the deadline passes, a
+                  DeadlineExceededException is raised.
+          
+        Returns:
+            context manager
+        """
+        @contextlib.contextmanager
+        def timeout_context():
+            prev_timeout, prev_deadline = self.getTimeoutOverride()
+
+            new_timeout = timeout if timeout is not None else prev_timeout
+            new_deadline = prev_deadline
+            if total is not None:
+                deadline = time.time() + total
+                new_deadline = deadline if prev_deadline is None else min(deadline, prev_deadline)
+
+            with self.overrideTimeout((new_timeout, new_deadline)):
+                yield
+
+        return timeout_context()
+
+    def getTimeoutOverride(self):
+        # returns the (timeout, deadline) set by withTimeout()
+        if self._timeout_override is not None:
+            return self._timeout_override.get()
+        return getattr(self._thread_local, 'timeout_override', (None, None))
+
+    @contextlib.contextmanager
+    def overrideTimeout(self, override):
+        if self._timeout_override is not None:
+            token = self._timeout_override.set(override)
+            try:
+                yield
+            finally:
+                self._timeout_override.reset(token)
+        else:
+            local = self._thread_local
+            prev_override = getattr(local, 'timeout_override', (None, None))
+            local.timeout_override = override
+            try:
+                yield
+            finally:
+                local.timeout_override = prev_override
+
+    def bindTimeoutOverride(self, func):
+        # Returns a function that calls func with the timeout and deadline set by withTimeout() in
+        # the current thread, for functions that send requests from worker threads (which do not
+        # inherit the current context).
+        override = self.getTimeoutOverride()
+
+        def call_with_override(*args):
+            with self.overrideTimeout(override):
+                return func(*args)
+        return call_with_override
+
+    def getRequestTimeout(self, timeout = None, deadline = None):
+        override_timeout, local_deadline = self.getTimeoutOverride()
+
+        if timeout is None:
+            timeout = override_timeout
+            if timeout is None:
+                timeout = self.timeout
+
+        if local_deadline is not None and (deadline is None or local_deadline < deadline):
+            deadline = local_deadline
+
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise DeadlineExceededException("Deadline exceeded before API request could be sent")
+
+            # a timeout of None means no timeout, so it is limited only by the deadline
+            if isinstance(timeout, tuple):
+                timeout = tuple(remaining if t is None else min(t, remaining) for t in timeout)
+            else:
+                timeout = remaining if timeout is None else min(timeout, remaining)
+
+        return timeout, deadline
+
+    def addHook(self, event, hook):
+        """
+        Adds a function that is called with a dict of information about each API request attempt
+        when the given event occurs. Hooks are called on the thread that sends the request, so
+        they should return quickly, and exceptions raised by hooks are propagated to the caller.
+        
+        Arguments:
+          - event
+              * 'before_request' (called before each attempt), 'after_response' (called after a
+                  successful response is received), or 'on_error' (called after each failed
+                  attempt, including attempts that will be retried)
+              * Required
+          
+          - hook (function)
+              * Function called with a dict containing `method`, `path`, `endpoint` (the path
+                  with object IDs replaced by '{id}'), `attempt`, `start_time` and `bytes_sent`,
+                  and after the request, `status_code`, `duration` (in seconds),
+                  `bytes_received`, and if the attempt failed, `error` and `will_retry`
+              * Required
+        """
+        if event not in _HOOK_EVENTS:
+            raise ValueError("Unknown hook event: %s" % event)
+        self.hooks.setdefault(event, []).append(hook)
+
+    def fireHook(self, event, info):
+        event_hooks = self.hooks.get(event)
+        if event_hooks:
+            for hook in event_hooks:
+                hook(info)
+
+    def isInstrumented(self):
+        return self.metrics is not None or bool(self.hooks)
+
+    def startRequest(self, method, path, attempt, data):
+        info = {
+            'method': method,
+            'path': path,
+            'endpoint': getEndpointName(path),
+            'attempt': attempt,
+            'bytes_sent': len(data) if data is not None else 0,
+        }
+        self.fireHook('before_request', info)
+        info['start_time'] = time.time()
+        return info
+
+    def recordRequest(self, info, status_code, bytes_received, error = None, will_retry = False):
+        info['duration'] = time.time() - info['start_time']
+        info['status_code'] = status_code
+        info['bytes_received'] = bytes_received
+
+        if error is not None:
+            info['error'] = error
+            info['will_retry'] = will_retry
+
+        if self.metrics is not None:
+            self.metrics.recordRequest(info)
+
+        self.fireHook('on_error' if error is not None else 'after_response', info)
+
+    def recordPage(self, method, path, page_number):
+        if self.metrics is not None:
+            self.metrics.recordPage(method, getEndpointName(path), page_number)
+
+    def getRetryDelay(self, method, path, attempt, error, status_code = None, retry_after = None, unprocessed = False):
+        if self.retry_policy is None:
+            return None
+        return self.retry_policy.getRetryDelay(method, path, attempt, error, status_code, retry_after, unprocessed)
+
+    def isConnectionError(self, error):
+        import requests
+
+        # True if the error occurred before the request could be sent to the server
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+
+        if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+            from requests.packages.urllib3.exceptions import NewConnectionError
+            return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+
+        return False
+
+    def doRequest(self, method, path, params = None, idempotency_key = None, timeout = None, deadline = None, cache_entity = False):
+        entity_cache = self.entity_cache
+
+        if method != 'GET':
+            if self.name_cache is not None:
+                self.name_cache.invalidate(method, path)
+            if self.response_cache is not None:
+                self.response_cache.invalidate(path)
+            if entity_cache is None:
+                return self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline)
+
+            entity_cache.invalidate(path)
+            try:
+                return self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline)
+            finally:
+                # also remove responses of GET requests that were in progress during the update
+                entity_cache.invalidate(path)
+
+        if self.response_cache is not None and self.response_cache.isCacheable(method, path):
+            cached_response = self.response_cache.get(self.response_cache.getKey(self, path, params))
+            if cached_response.is_fresh:
+                return self.json_codec.decode(cached_response.content)
+            return self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline, cached_response)
+
+        # only methods that fetch a single object by ID opt in to the entity cache
+        if entity_cache is not None and cache_entity:
+            res = entity_cache.get(path, self.json_codec)
+            if res is not None:
+                return res
+        else:
+            entity_cache = None
+
+        if self.single_flight is not None:
+            key = path if not params else path + '?' + repr(sorted(self.getUrlParams(params).items()))
+            res = self.single_flight.do(key, self.sendApiRequest, method, path, params, idempotency_key, timeout, deadline)
+        else:
+            res = self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline)
+
+        if entity_cache is not None:
+            entity_cache.put(path, res, self.json_codec)
+        return res
+
+    def sendApiRequest(self, method, path, params = None, idempotency_key = None, timeout = None, deadline = None, cached_response = None):
+        session = self.getSession()
+
+        url, headers, data, query = self.prepareRequest(method, path, params)
+
+        if cached_response is not None:
+            headers.update(cached_response.getValidatorHeaders())
+
+        journal = None
+        if idempotency_key is not None:
+            headers['Idempotency-Key'] = idempotency_key
+
+            journal = self.send_journal
+            if journal is not None:
+                res = journal.begin(idempotency_key, self.json_codec)
+                if res is not None:
+                    return res
+
+        instrumented = self.isInstrumented()
+        attempt = 0
+        processed = False # true if any attempt may have been processed by the server
+        try:
+            while True:
+                attempt += 1
+
+                if self.rate_limiter is not None:
+                    self.rate_limiter.wait(method, path)
+
+                request_timeout, request_deadline = self.getRequestTimeout(timeout, deadline)
+
+                with self._lock:
+                    self.num_requests += 1
+
+                if instrumented:
+                    info = self.startRequest(method, path, attempt, data)
+
+                previously_processed = processed
+                processed = True
+                response = None
+                bytes_received = 0
+                try:
+                    response = self.sendRequest(session, method, url, headers, data, query, request_timeout)
+
+                    content = response.content
+                    bytes_received = self.getResponseBytesReceived(response, len(content))
+                    self.compression_stats.addResponse(len(content), bytes_received)
+
+                    if cached_response is not None:
+                        res = self.parseCachedResponse(cached_response, path, response.status_code, content, response.headers)
+                    else:
+                        res = self.parseResponse(response.status_code, content)
+                except (IOError, APIException) as e:
+                    if response is None:
+                        unprocessed = self.isConnectionError(e)
+                        delay = self.getRetryDelay(method, path, attempt, e, unprocessed = unprocessed)
+                    else:
+                        unprocessed = isinstance(e, APIException) or response.status_code == 429
+                        delay = self.getRetryDelay(method, path, attempt, e, response.status_code, response.headers.get('Retry-After'), unprocessed)
+
+                    processed = previously_processed or not unprocessed
+
+                    will_retry = delay is not None and (request_deadline is None or time.time() + delay < request_deadline)
+
+                    if instrumented:
+                        self.recordRequest(info, response.status_code if response is not None else None, bytes_received, e, will_retry)
+
+                    if not will_retry:
+                        raise
+                else:
+                    if instrumented:
+                        self.recordRequest(info, response.status_code, bytes_received)
+
+                    if journal is not None:
+                        journal.complete(idempotency_key, res, self.json_codec)
+                    return res
+
+                time.sleep(delay)
+        except BaseException:
+            if journal is not None:
+                journal.abort(idempotency_key, processed)
+            raise
+
+    def sendRequest(self, session, method, url, headers, data, query, timeout, stream = False):
+        import requests
+
+        # Equivalent to session.request(), except that proxy and certificate settings from
+        # environment variables are only looked up once, rather than on every request.
+        # The Authorization header is set by prepareRequest; passing an auth callable also
+        # prevents requests from looking for credentials in ~/.netrc.
+        request = session.prepare_request(requests.Request(method, url,
+            headers = headers,
+            data = data,
+            params = query,
+            auth = _keepAuthorizationHeader
+        ))
+
+        settings = self._environment_settings
+        if settings is None:
+            settings = self._environment_settings = session.merge_environment_settings(self.api_url, {}, None, True, None)
+
+        return session.send(request,
+            timeout = timeout,
+            stream = stream,
+            proxies = settings['proxies'],
+            verify = settings['verify'],
+            cert = settings['cert']
+        )
+
+    def getResponseBytesReceived(self, response, num_bytes):
+        raw = response.raw
+        if raw is not None and hasattr(raw, 'tell'):
+            try:
+                return raw.tell()
+            except Exception:
+                pass
+        return num_bytes
+
+    def doStreamingRequest(self, method, path, params = None, array_key = 'data', deadline = None):
+        """
+        Sends an API request and returns an iterator over the items of the `array_key` array in
+        the response, which are parsed incrementally as the response body is received. After all
+        items have been read, the `result` property of the iterator contains the other properties
+        of the response.
+        
+        Streaming requests are not retried.
+        """
+        from .jsonstream import JSONArrayStream
+
+        session = self.getSession()
+
+        url, headers, data, query = self.prepareRequest(method, path, params)
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(method, path)
+
+        request_timeout, request_deadline = self.getRequestTimeout(None, deadline)
+
+        with self._lock:
+            self.num_requests += 1
+
+        info = None
+        if self.isInstrumented():
+            info = self.startRequest(method, path, 1, data)
+
+        try:
+            response = self.sendRequest(session, method, url, headers, data, query, request_timeout, stream = True)
+        except IOError as e:
+            if info is not None:
+                self.recordRequest(info, None, 0, e)
+            raise
+
+        return StreamingResponse(self, response, JSONArrayStream(response.iter_content(65536), array_key), info)
+
+    def hydrate(self, entities, max_workers = 8):
+        """
+        Loads the data of many entities that were initialized without being loaded (e.g. via
+        `initContactById`), using up to `max_workers` concurrent requests, instead of sending
+        one request at a time when their fields are first accessed.
+        
+        Entities that are already loaded are skipped, and entities that refer
+        to the same object are loaded with a single request. Raises an exception (e.g.
+        NotFoundException) if any entity could not be loaded.
+        
+        Arguments:
+          - entities (array)
+              * Entities to load
+              * Required
+          
+          - max_workers (int)
+              * Maximum number of requests sent concurrently
+              * Default: 8
+        
+        Returns:
+            array (the entities)
+        """
+        from .bulk import mapBatches
+
+        entities = list(entities)
+        for batch, res in mapBatches(self.bindTimeoutOverride(self.loadEntityBatch), self.getUnloadedEntityBatches(entities), max_workers, ordered = False):
+            pass # wait until all batches are loaded
+        return entities
+
+    def getUnloadedEntityBatches(self, entities):
+        # groups unloaded entities that refer to the same object
+        batches = {}
+        for entity in entities:
+            if not entity._is_loaded:
+                batches.setdefault(entity.getBaseApiPath(), []).append(entity)
+        return list(batches.values())
+
+    def loadEntityBatch(self, batch):
+        res = self.doRequest('GET', batch[0].getBaseApiPath(), cache_entity = True)
+        for i, entity in enumerate(batch):
+            entity._setLoadedData(res if i == 0 else self.json_codec.decode(self.json_codec.encode(res)))
+
     def newApiCursor(self, item_cls, path, options):
         from .apicursor import APICursor
         return APICursor(self, item_cls, path, options)
 
+def _keepAuthorizationHeader(request):
+    return request
+
+class StreamingResponse(object):
+    def __init__(self, api, response, stream, info = None):
+        self.api = api
+        self.response = response
+        self.stream = stream
+        self.info = info
+        self.result = None
+        self.closed = False
+
+    def __iter__(self):
+        error = None
+        try:
+            for item in self.stream:
+                yield item
+            self.result = self.api.checkResponse(self.stream.result)
+        except ValueError:
+            error = IOError("Unexpected response from Telerivet API (HTTP {})".format(self.response.status_code))
+            raise error
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.finish(error)
+
+    def close(self):
+        """
+        Closes the response without reading the rest of it, e.g. when iteration is stopped early.
+        """
+        self.finish(None)
+
+    def finish(self, error):
+        if self.closed:
+            return
+        self.closed = True
+
+        self.response.close()
+
+        if self.info is not None:
+            self.api.recordRequest(self.info, self.response.status_code, self.api.getResponseBytesReceived(self.response, 0), error)
+
+_HOOK_EVENTS = frozenset(['before_request', 'after_response', 'on_error'])
+
 class TelerivetException(Exception):
     pass
 
@@ -255,3 +946,25 @@ class InvalidParameterException(APIException):
     def __init__(self, message, code, param):
         super(InvalidParameterException, self).__init__(message, code)
         self.param = param
+
+class DeadlineExceededException(TelerivetException):
+    pass
+
+class DuplicateSendException(TelerivetException):
+    def __init__(self, message, idempotency_key):
+        super(DuplicateSendException, self).__init__(message)
+        self.idempotency_key = idempotency_key
+
+from .compression import CompressionStats, compress
+from .entitycache import EntityCache
+from .jsoncodec import JSONCodec, getJSONCodec
+from .metrics import Metrics, getEndpointName
+from .namecache import NameCache
+from .ratelimiter import RateLimiter
+from .responsecache import ResponseCache
+from .retrypolicy import RetryPolicy
+from .sendjournal import SendJournal
+from .singleflight import SingleFlight
+
+if sys.version_info >= (3, 6):
+    from .asyncapi import AsyncAPI
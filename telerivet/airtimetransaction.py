@@ -92,5 +92,7 @@ class AirtimeTransaction(Entity):
           * Updatable via API
     """
 
+    __slots__ = ()
+
     def getBaseApiPath(self):
         return "/projects/%(project_id)s/airtime_transactions/%(id)s" % {'project_id': self.project_id, 'id': self.id} 
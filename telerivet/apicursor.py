@@ -1,3 +1,5 @@
+from . import TelerivetException
+
 class APICursor:
     """
     An easy-to-use interface for interacting with API methods that return collections of objects
@@ -26,6 +28,25 @@ class APICursor:
         self.next_marker = None
         self._limit = None
         self.offset = 0
+        self._prefetch = 0
+        self._prefetched_pages = None
+        self._prefetch_stopped = False
+        self._raw = False
+        self._field_paths = None
+        self._deadline = None
+        self._stream = False
+        self._page_response = None
+        self._page_items = None
+        self._page_marker = None
+        self._page_item_count = 0
+        self._skip_items = 0
+        self._num_pages = 0
+        self._operation = None
+
+        if api.tracing is not None:
+            import sys
+            from .tracing import getOperationName
+            self._operation = getOperationName(sys._getframe(1))
 
     def limit(self, limit):
         """
@@ -48,6 +69,294 @@ class APICursor:
         self._limit = limit
         return self
 
+    def deadline(self, seconds):
+        """
+        Limits the total time spent fetching results from this cursor.
+        
+        The deadline applies to all API requests made by this cursor after
+        this method is called, including requests for additional pages and retries. The timeout
+        of each request is reduced as necessary so that it does not exceed the deadline. If the
+        deadline passes, a DeadlineExceededException (or the timeout error raised by the HTTP
+        client) is raised.
+        
+        Arguments:
+          - seconds (float)
+              * Maximum number of seconds from now
+              * Required
+          
+        Returns:
+            the current APICursor object
+        """
+        import time
+
+        self._deadline = time.time() + seconds
+        return self
+
+    def raw(self):
+        """
+        Returns each result as a dict containing the data returned by the API, instead of an
+        Entity object.
+        
+        This avoids the overhead of constructing an Entity object for each
+        result, which is useful when processing large result sets.
+        
+        Returns:
+            the current APICursor object
+        """
+
+        self._raw = True
+        return self
+
+    def fields(self, *names):
+        """
+        Returns each result as a tuple containing only the values of the given fields, instead of
+        an Entity object.
+        
+        Custom variables can be retrieved with names like 'vars.foo'. Fields
+        that are not set are returned as None.
+        
+        Arguments:
+          - names
+              * Names of the fields to return, in order
+              * Required
+          
+        Returns:
+            the current APICursor object
+        """
+
+        self._field_paths = [name.split('.') for name in names]
+        return self
+
+    def stream(self):
+        """
+        Parses each page of results incrementally as it is received from the API, instead of
+        reading the entire page into memory before returning the first result.
+        
+        This reduces memory usage and the time until the first result is
+        returned when fetching large pages (e.g. with a `page_size` of 500). Requests for each page
+        are not retried if they fail. This option has no effect if prefetch() is also used.
+        
+        Returns:
+            the current APICursor object
+        """
+
+        self._stream = True
+        return self
+
+    def prefetch(self, num_pages = 1):
+        """
+        Fetches up to the given number of result pages in a background thread while the current
+        page is being processed.
+        
+        When iterating over large result sets, this hides most of the latency
+        of fetching each page from the API. Each page is still fetched with a separate API
+        request, in the same order as without prefetching.
+        
+        If you stop iterating before reaching the end of the result set, call
+        close() to stop the background thread. Otherwise, it stops within about a second after the
+        cursor is garbage collected.
+        
+        Arguments:
+          - num_pages (int)
+              * The maximum number of pages to fetch ahead of the current page
+              * Default: 1
+          
+        Returns:
+            the current APICursor object
+        """
+
+        self._prefetch = num_pages
+        return self
+
+    def close(self):
+        """
+        Stops fetching result pages in the background, if prefetch() was called, and closes the
+        connection used to read the current page, if stream() was called.
+        
+        Iteration may continue after close(), fetching the remaining results
+        without prefetching; the unread part of a streaming page is fetched again.
+        """
+
+        self._prefetch_stopped = True
+        self.closeStreamingPage()
+
+    def parallelScan(self, workers = 4, field = 'time_created', min_value = None, max_value = None, boundaries = None):
+        """
+        Fetches all entities matching the current query by splitting the query into disjoint
+        ranges of a field and fetching each range concurrently in a separate thread.
+        
+        Since each query can only fetch one page at a time, this allows
+        exporting a large result set (e.g. all messages in a project over a long period of time)
+        much faster than iterating over the cursor normally.
+        
+        For numeric fields such as `time_created`, the range between
+        `min_value` and `max_value` is split into `workers` equal ranges using the `[min]` and
+        `[max]` modifiers. If `min_value` or `max_value` is not provided, the value of the
+        `field[min]` or `field[max]` query parameter is used.
+        
+        For string fields such as `name`, provide a sorted list of `boundaries`;
+        each range is fetched using the `[gte]` and `[lt]` modifiers. Entities where the field is
+        null are not included in any range.
+        
+        Entities are returned in the order they are fetched, not in the
+        order of the query's `sort` parameter. If a limit is set, at most that many entities are
+        returned. If you stop iterating before reaching the end of the results, call close() to
+        stop the background threads.
+        
+        Arguments:
+          - workers (int)
+              * Number of ranges to fetch concurrently (for numeric fields)
+              * Default: 4
+          
+          - field
+              * Name of the field used to split the query into ranges
+              * Default: time_created
+          
+          - min_value
+              * Start of the range of a numeric field (inclusive)
+          
+          - max_value
+              * End of the range of a numeric field (exclusive)
+          
+          - boundaries (array)
+              * Sorted list of values of a string field at which to split the query into ranges
+          
+        Returns:
+            iterator of Entity
+        """
+
+        if boundaries is not None:
+            range_params = self.getStringRangeParams(field, boundaries)
+        else:
+            range_params = self.getNumericRangeParams(workers, field, min_value, max_value)
+
+        return self.scanRanges(range_params)
+
+    def getNumericRangeParams(self, workers, field, min_value, max_value):
+        params = self.params
+        field_params = params.get(field) if isinstance(params.get(field), dict) else {}
+
+        if min_value is None:
+            min_value = params.get(field + '[min]', field_params.get('min'))
+        if max_value is None:
+            max_value = params.get(field + '[max]', field_params.get('max'))
+
+        if min_value is None or max_value is None:
+            raise TelerivetException("parallelScan requires min_value and max_value, or the %s[min] and %s[max] query parameters" % (field, field))
+
+        range_params = []
+        start = min_value
+        for i in range(workers):
+            if i == workers - 1:
+                end = max_value
+            elif isinstance(min_value, int) and isinstance(max_value, int):
+                end = min_value + (max_value - min_value) * (i + 1) // workers
+            else:
+                end = min_value + (max_value - min_value) * (i + 1) / float(workers)
+
+            if end > start:
+                range_params.append(self.getRangeParams(field, {'min': start, 'max': end}))
+            start = end
+
+        return range_params
+
+    def getStringRangeParams(self, field, boundaries):
+        range_params = []
+        start = None
+        for end in list(boundaries) + [None]:
+            modifiers = {}
+            if start is not None:
+                modifiers['gte'] = start
+            if end is not None:
+                modifiers['lt'] = end
+            range_params.append(self.getRangeParams(field, modifiers))
+            start = end
+
+        return range_params
+
+    def getRangeParams(self, field, modifiers):
+        params = self.params.copy()
+
+        field_params = params.get(field)
+        if isinstance(field_params, dict):
+            field_params = field_params.copy()
+            for modifier in ('min', 'max', 'gte', 'gt', 'lt', 'lte'):
+                field_params.pop(modifier, None)
+            if field_params:
+                params[field] = field_params
+            else:
+                del params[field]
+
+        for modifier in ('min', 'max', 'gte', 'gt', 'lt', 'lte'):
+            params.pop(field + '[' + modifier + ']', None)
+
+        for modifier, value in modifiers.items():
+            params[field + '[' + modifier + ']'] = value
+
+        return params
+
+    def scanRanges(self, range_params):
+        import threading
+        try:
+            import queue
+        except ImportError:
+            import Queue as queue
+
+        pages = queue.Queue(len(range_params) * 2)
+        self._prefetch_stopped = False
+
+        def scan_range(params):
+            cursor = APICursor(self.api, None, self.path, params)
+            cursor._limit = self._limit
+            cursor._deadline = self._deadline
+            try:
+                while not self._prefetch_stopped:
+                    cursor.loadNextPage()
+                    self.putPage(pages, (cursor.data, None))
+                    if not cursor.truncated:
+                        break
+            except Exception as e:
+                self.putPage(pages, (None, e))
+            self.putPage(pages, None)
+
+        for params in range_params:
+            thread = threading.Thread(target = self.api.bindTimeoutOverride(scan_range), args = (params,))
+            thread.daemon = True
+            thread.start()
+
+        num_running = len(range_params)
+        try:
+            while num_running > 0:
+                page = pages.get()
+                if page is None:
+                    num_running -= 1
+                    continue
+
+                data, error = page
+                if error is not None:
+                    raise error
+
+                for item_data in data:
+                    if self._limit is not None and self.offset >= self._limit:
+                        return
+                    self.offset += 1
+                    yield self.makeItem(item_data)
+        finally:
+            self._prefetch_stopped = True
+
+    def putPage(self, pages, page):
+        try:
+            import queue
+        except ImportError:
+            import Queue as queue
+
+        while not self._prefetch_stopped:
+            try:
+                pages.put(page, timeout = 1)
+                return
+            except queue.Full:
+                pass
+
     def count(self):
         """
         Returns the total count of entities matching the current query, without actually fetching
@@ -65,7 +374,7 @@ class APICursor:
             params = self.params.copy()
             params['count'] = 1
 
-            res = self.api.doRequest("GET", self.path, params)
+            res = self.api.doRequest("GET", self.path, params, deadline = self._deadline)
             self._count = int(res['count'])
 
         return self._count
@@ -97,14 +406,14 @@ class APICursor:
         if self.data is None:
             self.loadNextPage()
 
-        if self.pos < len(self.data):
+        if self.hasPageItem():
             return True
 
         if not self.truncated:
             return False
 
         self.loadNextPage()
-        return self.pos < len(self.data)
+        return self.hasPageItem()
 
     def next(self):
         """
@@ -116,21 +425,57 @@ class APICursor:
         if self._limit is not None and self.offset >= self._limit:
             raise StopIteration
 
-        if (self.data is None) or (self.pos >= len(self.data) and self.truncated):
+        if (self.data is None) or (not self.hasPageItem() and self.truncated):
             self.loadNextPage()
 
-        if self.pos < len(self.data):
+        if self.hasPageItem():
             item_data = self.data[self.pos]
             self.pos += 1
             self.offset += 1
-            cls = self.item_cls
-            if cls:
-                return cls(self.api, item_data, True)
-            else:
-                return item_data
+            if self._limit is not None and self.offset >= self._limit:
+                # the rest of a streaming page will not be read
+                self.closeStreamingPage()
+            return self.makeItem(item_data)
         else:
             raise StopIteration
 
+    def hasPageItem(self):
+        if self.pos < len(self.data):
+            return True
+
+        page_items = self._page_items
+        if page_items is not None:
+            # when streaming, only the current item of the page is kept in memory
+            for item_data in page_items:
+                self.data = [item_data]
+                self.pos = 0
+                self._page_item_count += 1
+                return True
+
+            self._page_items = None
+            response = self._page_response.result
+            self.truncated = response['truncated']
+            self.next_marker = response['next_marker']
+
+        return False
+
+    def makeItem(self, item_data):
+        field_paths = self._field_paths
+        if field_paths is not None:
+            values = []
+            for path in field_paths:
+                value = item_data
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                values.append(value)
+            return tuple(values)
+
+        cls = self.item_cls
+        if cls and not self._raw:
+            return cls(self.api, item_data, True)
+        else:
+            return item_data
+
     def __next__(self):
         return self.next()
 
@@ -138,17 +483,134 @@ class APICursor:
         return self
 
     def loadNextPage(self):
+        if self.api.tracing is not None:
+            with self.api.tracing.pageSpan(self, self._num_pages + 1):
+                self.fetchNextPage()
+        else:
+            self.fetchNextPage()
+
+    def fetchNextPage(self):
+        if self._prefetch > 0:
+            self.setPage(self.getPrefetchedPage())
+        elif self._stream:
+            self.loadStreamingPage()
+        else:
+            self.setPage(self.api.doRequest("GET", self.path, self.getPageParams(self.next_marker), deadline = self._deadline))
+
+        self._num_pages += 1
+        self.api.recordPage("GET", self.path, self._num_pages)
+
+        # skip the items of a streaming page that were returned before close() was called
+        while self._skip_items > 0 and self.hasPageItem():
+            self._skip_items -= 1
+            self.pos += 1
+        self._skip_items = 0
+
+    def loadStreamingPage(self):
+        self._page_marker = self.next_marker
+        self._page_item_count = 0
+        self._page_response = self.api.doStreamingRequest("GET", self.path, self.getPageParams(self.next_marker), deadline = self._deadline)
+        self._page_items = iter(self._page_response)
+        self.data = []
+        self.pos = 0
+        self.truncated = None
+
+    def closeStreamingPage(self):
+        if self._page_items is not None:
+            self._page_items = None
+            self._page_response.close()
+
+            # if iteration continues, the rest of the page is fetched again, as with prefetch()
+            self._skip_items = self._page_item_count - (len(self.data) - self.pos)
+            self.next_marker = self._page_marker
+            self.truncated = True
+            self.data = []
+            self.pos = 0
+
+    def getPageParams(self, next_marker):
         request_params = self.params.copy()
 
-        if self.next_marker is not None:
-            request_params['marker'] = self.next_marker
+        if next_marker is not None:
+            request_params['marker'] = next_marker
 
         if self._limit is not None and not ("page_size" in request_params):
             request_params["page_size"] = min(self._limit, 200)
 
-        response = self.api.doRequest("GET", self.path, request_params)
+        return request_params
+
+    def getPrefetchedPage(self):
+        if self._prefetch_stopped:
+            # close() was called, so fetch any remaining pages without prefetching
+            return self.api.doRequest("GET", self.path, self.getPageParams(self.next_marker), deadline = self._deadline)
 
+        if self._prefetched_pages is None:
+            import threading
+            try:
+                import queue
+            except ImportError:
+                import Queue as queue
+
+            self._prefetched_pages = queue.Queue(self._prefetch)
+            import weakref
+            thread = threading.Thread(target = self.api.bindTimeoutOverride(_prefetchPages), args = (weakref.ref(self), self._prefetched_pages, self.next_marker))
+            thread.daemon = True
+            thread.start()
+
+        response, error = self._prefetched_pages.get()
+        if error is not None:
+            # the background thread stops after an error, so if iteration continues, a new thread
+            # starts again from the page that failed
+            self._prefetched_pages = None
+            raise error
+        return response
+
+    def setPage(self, response):
         self.data = response['data']
         self.truncated = response['truncated']
         self.next_marker = response['next_marker']
-        self.pos = 0
\ No newline at end of file
+        self.pos = 0
+
+def _prefetchPages(cursor_ref, pages, next_marker):
+    # Runs in the background thread started by APICursor.getPrefetchedPage. The thread only
+    # keeps a weak reference to the cursor while waiting for the queue to have space, so it
+    # stops if the cursor is garbage collected without calling close() (e.g. after 'break').
+    try:
+        import queue
+    except ImportError:
+        import Queue as queue
+
+    num_fetched = 0
+
+    while True:
+        cursor = cursor_ref()
+        if cursor is None or cursor._prefetch_stopped:
+            return
+
+        try:
+            response = cursor.api.doRequest("GET", cursor.path, cursor.getPageParams(next_marker), deadline = cursor._deadline)
+            page = (response, None)
+        except Exception as e:
+            response = None
+            page = (None, e)
+
+        limit = cursor._limit
+        cursor = None
+
+        while True:
+            try:
+                pages.put(page, timeout = 1)
+                break
+            except queue.Full:
+                cursor = cursor_ref()
+                if cursor is None or cursor._prefetch_stopped:
+                    return
+                cursor = None
+
+        if response is None or not response['truncated']:
+            return
+
+        num_fetched += len(response['data'])
+        if limit is not None and num_fetched >= limit:
+            return
+
+        next_marker = response['next_marker']
@@ -0,0 +1,553 @@
+import asyncio
+import time
+
+from . import API, APIException, TelerivetException
+from .apicursor import APICursor
+from .entity import Entity
+
+class AsyncAPI(object):
+    """
+    Initializes an asyncio-based client handle to the Telerivet REST API.
+
+    AsyncAPI provides the same methods as telerivet.API, and entities
+    returned by AsyncAPI provide the same methods as the corresponding entity classes, except that
+    every method that may make an API request is a coroutine and must be awaited, e.g.:
+
+        tr = telerivet.AsyncAPI(API_KEY)
+        project = tr.initProjectById(PROJECT_ID)
+        message = await project.sendMessage(to_number = '555-0001', content = 'Hello world!')
+
+        async for contact in project.queryContacts(name = {'prefix': 'John'}):
+            print(contact.name)
+
+    Methods beginning with `init` or `query` never make an API request,
+    so they return their result immediately. Query methods return an AsyncAPICursor, which
+    supports `async for` iteration.
+
+    Fields of entities that were initialized without being loaded (e.g.
+    via `initContactById`) are not available until you call `await entity.load()`.
+
+    Methods that send requests concurrently from a thread pool (such as
+    `Project.sendMultiBulk` and `Project.importContactsStream`) are not supported, and raise a TelerivetException.
+
+    Requests are sent using the aiohttp module, which must be installed
+    separately (`pip install telerivet[async]`).
+
+    Arguments:
+      - api_key (Your Telerivet API key; see <https://telerivet.com/dashboard/api>)
+          * Required
+
+      - api_url
+          * Base URL of the Telerivet REST API
+
+      - session (aiohttp.ClientSession)
+          * Session used to send requests (by default, a new session is created when the first
+              request is sent)
+
+      - rate_limiter (RateLimiter or float)
+          * Limits the rate of API requests sent by this client handle (see telerivet.API)
+
+      - retry_policy (RetryPolicy)
+          * Determines when failed requests are automatically retried (see telerivet.API)
+
+      - send_journal (SendJournal)
+          * Records the outcome of requests that send messages (see telerivet.API)
+
+      - timeout (float or tuple)
+          * Default timeout in seconds for each API request (see telerivet.API). To limit the
+              total time of an awaited method, use asyncio.wait_for().
+
+      - json_codec
+          * JSON library used to encode requests and decode responses (see telerivet.API)
+
+      - compression, compression_threshold, compression_level
+          * Compression of request bodies (see telerivet.API)
+
+      - entity_cache (bool or EntityCache)
+          * Caches responses of requests that retrieve a single object (see telerivet.API)
+
+      - name_cache (bool or NameCache)
+          * Caches groups, labels and data tables by name (see telerivet.API)
+
+      - response_cache (ResponseCache)
+          * Saves responses of endpoints that return slow-changing metadata (see telerivet.API)
+
+      - coalesce_requests (bool)
+          * If true, identical GET requests awaited concurrently are only sent once
+
+      - hooks, metrics, tracer
+          * Functions called for each request attempt, metrics about requests, and
+              OpenTelemetry tracing (see telerivet.API). Hooks are called on the event loop
+              thread. Request spans are named after the HTTP method and endpoint.
+    """
+
+    def __init__(self, api_key, api_url = 'https://api.telerivet.com/v1', session = None, **options):
+        self._api = _ReplayAPI(self, api_key, api_url, **options)
+        self.session = session
+        self._in_flight = {}
+
+    @property
+    def num_requests(self):
+        return self._api.num_requests
+
+    def __getattr__(self, name):
+        return self._wrapMember(self._api, name)
+
+    async def doRequest(self, method, path, params = None, idempotency_key = None, timeout = None, deadline = None, cache_entity = False):
+        api = self._api
+        entity_cache = api.entity_cache
+
+        if method != 'GET':
+            if api.name_cache is not None:
+                api.name_cache.invalidate(method, path)
+            if api.response_cache is not None:
+                api.response_cache.invalidate(path)
+            if entity_cache is None:
+                return await self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline)
+
+            entity_cache.invalidate(path)
+            try:
+                return await self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline)
+            finally:
+                entity_cache.invalidate(path)
+
+        if api.response_cache is not None and api.response_cache.isCacheable(method, path):
+            cached_response = api.response_cache.get(api.response_cache.getKey(api, path, params))
+            if cached_response.is_fresh:
+                return api.json_codec.decode(cached_response.content)
+            return await self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline, cached_response)
+
+        # only methods that fetch a single object by ID opt in to the entity cache
+        if entity_cache is not None and cache_entity:
+            res = entity_cache.get(path, api.json_codec)
+            if res is not None:
+                return res
+        else:
+            entity_cache = None
+
+        if api.single_flight is not None:
+            key = path if not params else path + '?' + repr(sorted(api.getUrlParams(params).items()))
+            res = await self.coalesceRequest(key, method, path, params, idempotency_key, timeout, deadline)
+        else:
+            res = await self.sendApiRequest(method, path, params, idempotency_key, timeout, deadline)
+
+        if entity_cache is not None:
+            entity_cache.put(path, res, api.json_codec)
+        return res
+
+    async def coalesceRequest(self, key, *args):
+        # Like SingleFlight.do, for concurrent coroutines: only the first coroutine sends the
+        # request, and the others wait for a copy of its result.
+        single_flight = self._api.single_flight
+        codec = self._api.json_codec
+
+        call = self._in_flight.get(key)
+        if call is not None:
+            call[1] += 1
+            single_flight.coalesced += 1
+            return codec.decode(await asyncio.shield(call[0]))
+
+        future = asyncio.get_event_loop().create_future()
+        call = self._in_flight[key] = [future, 0]
+        single_flight.requests += 1
+
+        try:
+            res = await self.sendApiRequest(*args)
+        except BaseException as e:
+            if call[1] > 0:
+                future.set_exception(e if isinstance(e, Exception) else TelerivetException("The API request was interrupted"))
+            raise
+        else:
+            if call[1] > 0:
+                future.set_result(codec.encode(res))
+            return res
+        finally:
+            del self._in_flight[key]
+
+    async def sendApiRequest(self, method, path, params = None, idempotency_key = None, timeout = None, deadline = None, cached_response = None):
+        import aiohttp
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+
+        api = self._api
+        url, headers, data, query = api.prepareRequest(method, path, params)
+
+        if cached_response is not None:
+            headers.update(cached_response.getValidatorHeaders())
+
+        journal = None
+        if idempotency_key is not None:
+            headers['Idempotency-Key'] = idempotency_key
+
+            journal = api.send_journal
+            if journal is not None:
+                res = journal.begin(idempotency_key, api.json_codec)
+                if res is not None:
+                    return res
+
+        instrumented = api.isInstrumented()
+        attempt = 0
+        processed = False # true if any attempt may have been processed by the server
+        try:
+            while True:
+                attempt += 1
+
+                if api.rate_limiter is not None:
+                    delay = api.rate_limiter.reserve(method, path)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                request_timeout, request_deadline = api.getRequestTimeout(timeout, deadline)
+                if isinstance(request_timeout, tuple):
+                    client_timeout = aiohttp.ClientTimeout(sock_connect = request_timeout[0], sock_read = request_timeout[1])
+                else:
+                    client_timeout = aiohttp.ClientTimeout(total = request_timeout)
+
+                api.num_requests += 1
+
+                if instrumented:
+                    info = api.startRequest(method, path, attempt, data)
+
+                previously_processed = processed
+                processed = True
+                status_code = None
+                retry_after = None
+                bytes_received = 0
+                try:
+                    async with self.session.request(method, url,
+                        headers = headers,
+                        data = data,
+                        params = query,
+                        timeout = client_timeout
+                    ) as response:
+                        status_code = response.status
+                        response_headers = response.headers
+                        retry_after = response_headers.get('Retry-After')
+                        content = await response.read()
+
+                    num_bytes = len(content)
+                    bytes_received = response.content_length or num_bytes
+                    api.compression_stats.addResponse(num_bytes, bytes_received)
+
+                    if cached_response is not None:
+                        res = api.parseCachedResponse(cached_response, path, status_code, content, response_headers)
+                    else:
+                        res = api.parseResponse(status_code, content)
+                except (IOError, APIException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if status_code is None:
+                        unprocessed = isinstance(e, aiohttp.ClientConnectorError)
+                    else:
+                        unprocessed = isinstance(e, APIException) or status_code == 429
+
+                    delay = api.getRetryDelay(method, path, attempt, e, status_code, retry_after, unprocessed)
+                    processed = previously_processed or not unprocessed
+
+                    will_retry = delay is not None and (request_deadline is None or time.time() + delay < request_deadline)
+
+                    if instrumented:
+                        api.recordRequest(info, status_code, bytes_received, e, will_retry)
+
+                    if not will_retry:
+                        raise
+                else:
+                    if instrumented:
+                        api.recordRequest(info, status_code, bytes_received)
+
+                    if journal is not None:
+                        journal.complete(idempotency_key, res, api.json_codec)
+                    return res
+
+                await asyncio.sleep(delay)
+        except BaseException:
+            if journal is not None:
+                journal.abort(idempotency_key, processed)
+            raise
+
+    async def hydrate(self, entities, max_workers = 8):
+        """
+        Loads the data of many entities that were initialized without being loaded (e.g. via
+        `initContactById`), with up to `max_workers` requests in progress at a time (see
+        telerivet.API.hydrate).
+
+        Returns:
+            array (the entities)
+        """
+        api = self._api
+        entities = list(entities)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def load_batch(batch):
+            async with semaphore:
+                res = await self.doRequest('GET', batch[0].getBaseApiPath(), cache_entity = True)
+            for i, entity in enumerate(batch):
+                entity._setLoadedData(res if i == 0 else api.json_codec.decode(api.json_codec.encode(res)))
+
+        batches = api.getUnloadedEntityBatches([self._unwrap(entity) for entity in entities])
+        await asyncio.gather(*[load_batch(batch) for batch in batches])
+        return entities
+
+    async def close(self):
+        """
+        Closes the aiohttp session used by this client handle.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _call(self, func, args, kwargs):
+        # Runs a synchronous client method, suspending it each time it needs an API response.
+        # When the method calls doRequest for a response that has not been received yet,
+        # _PendingRequest aborts the method; the request is then awaited and the method is
+        # run again from the start, with doRequest replaying the responses received so far.
+        api = self._api
+        args = [self._unwrap(arg) for arg in args]
+        kwargs = dict((key, self._unwrap(value)) for key, value in kwargs.items())
+        responses = []
+
+        while True:
+            api._responses = responses
+            api._response_index = 0
+            try:
+                result = func(*args, **kwargs)
+            except _PendingRequest as pending:
+                request = pending.request
+            else:
+                return self._wrap(result)
+            finally:
+                api._responses = None
+
+            method, path, params, options = request
+            responses.append(await self.doRequest(method, path, params, **options))
+
+    def _wrapMember(self, target, name):
+        value = getattr(target, name)
+
+        if not callable(value) or name.startswith('_') or name in _SYNC_METHODS:
+            return value
+
+        if name in _UNSUPPORTED_METHODS:
+            def method(*args, **kwargs):
+                raise TelerivetException("%s.%s is not supported by AsyncAPI; %s" % (type(target).__name__, name, _UNSUPPORTED_METHODS[name]))
+            method.__name__ = name
+            return method
+
+        if name.startswith(_NO_REQUEST_PREFIXES):
+            def method(*args, **kwargs):
+                args = [self._unwrap(arg) for arg in args]
+                kwargs = dict((key, self._unwrap(v)) for key, v in kwargs.items())
+                return self._wrap(value(*args, **kwargs))
+        else:
+            async def method(*args, **kwargs):
+                return await self._call(value, args, kwargs)
+
+        method.__name__ = name
+        method.__doc__ = value.__doc__
+        return method
+
+    def _wrap(self, value):
+        if isinstance(value, Entity):
+            return AsyncEntity(self, value)
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, AsyncEntity):
+            return value._entity
+        return value
+
+class AsyncEntity(object):
+    """
+    Wraps a Telerivet entity (Project, Contact, Message, etc.) returned by AsyncAPI.
+
+    Fields of the entity can be read and updated as usual. Methods of the
+    entity that may make an API request are coroutines and must be awaited.
+    """
+
+    __slots__ = ('_async_api', '_entity')
+
+    def __init__(self, async_api, entity):
+        object.__setattr__(self, '_async_api', async_api)
+        object.__setattr__(self, '_entity', entity)
+
+    def __getattr__(self, name):
+        return self._async_api._wrapMember(self._entity, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._entity, name, value)
+
+    def __repr__(self):
+        return repr(self._entity)
+
+class AsyncAPICursor(APICursor):
+    """
+    An APICursor for use with AsyncAPI. Iterate over the results with `async for`.
+
+    The stream(), prefetch() and parallelScan() methods of APICursor are
+    not supported, and raise a TelerivetException.
+    """
+
+    def __init__(self, async_api, api, item_cls, path, params = None):
+        APICursor.__init__(self, api, item_cls, path, params)
+        self.async_api = async_api
+
+    def stream(self):
+        raise TelerivetException("AsyncAPICursor does not support stream()")
+
+    def prefetch(self, num_pages = 1):
+        raise TelerivetException("AsyncAPICursor does not support prefetch(); pages are fetched when iterating with 'async for'")
+
+    def parallelScan(self, workers = 4, field = 'time_created', min_value = None, max_value = None, boundaries = None):
+        raise TelerivetException("AsyncAPICursor does not support parallelScan(); run several queries with disjoint ranges concurrently instead, e.g. using asyncio.gather")
+
+    async def count(self):
+        """
+        Returns the total count of entities matching the current query, without actually fetching
+        the entities themselves.
+
+        Returns:
+            int
+        """
+
+        if self._count == -1:
+            params = self.params.copy()
+            params['count'] = 1
+
+            res = await self.async_api.doRequest("GET", self.path, params, deadline = self._deadline)
+            self._count = int(res['count'])
+
+        return self._count
+
+    async def all(self):
+        """
+        Get all entities matching the current query in an array.
+
+        Returns:
+            array
+        """
+
+        return [item async for item in self]
+
+    async def hasNext(self):
+        """
+        Returns true if there are any more entities in the result set, false otherwise
+
+        Returns:
+            bool
+        """
+        if self._limit is not None and self.offset >= self._limit:
+            return False
+
+        if self.data is None:
+            await self.loadNextPage()
+
+        if self.pos < len(self.data):
+            return True
+
+        if not self.truncated:
+            return False
+
+        await self.loadNextPage()
+        return self.pos < len(self.data)
+
+    async def next(self):
+        """
+        Returns the next entity in the result set.
+
+        Returns:
+            AsyncEntity
+        """
+        if self._limit is not None and self.offset >= self._limit:
+            raise StopAsyncIteration
+
+        if (self.data is None) or (self.pos >= len(self.data) and self.truncated):
+            await self.loadNextPage()
+
+        if self.pos < len(self.data):
+            item_data = self.data[self.pos]
+            self.pos += 1
+            self.offset += 1
+            return self.async_api._wrap(self.makeItem(item_data))
+        else:
+            raise StopAsyncIteration
+
+    def __next__(self):
+        raise TypeError("AsyncAPICursor must be iterated with 'async for'")
+
+    def __iter__(self):
+        raise TypeError("AsyncAPICursor must be iterated with 'async for'")
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.next()
+
+    async def loadNextPage(self):
+        if self.api.tracing is not None:
+            with self.api.tracing.pageSpan(self, self._num_pages + 1):
+                await self.fetchNextPage()
+        else:
+            await self.fetchNextPage()
+
+    async def fetchNextPage(self):
+        response = await self.async_api.doRequest("GET", self.path, self.getPageParams(self.next_marker), deadline = self._deadline)
+        self.setPage(response)
+
+        self._num_pages += 1
+        self.api.recordPage("GET", self.path, self._num_pages)
+
+class _ReplayAPI(API):
+    # API handle shared by all entities created via AsyncAPI. Instead of sending requests itself,
+    # doRequest replays responses received by AsyncAPI._call, or raises _PendingRequest.
+
+    def __init__(self, async_api, api_key, api_url, **options):
+        API.__init__(self, api_key, api_url, **options)
+        self._async_api = async_api
+        self._responses = None
+        self._response_index = 0
+
+    def doRequest(self, method, path, params = None, **options):
+        responses = self._responses
+        if responses is None:
+            raise TelerivetException("API requests made via AsyncAPI must be awaited (call 'await entity.load()' before accessing fields of an entity that is not loaded)")
+
+        index = self._response_index
+        if index < len(responses):
+            self._response_index = index + 1
+            return responses[index]
+
+        raise _PendingRequest((method, path, params, options))
+
+    def newApiCursor(self, item_cls, path, options):
+        return AsyncAPICursor(self._async_api, self, item_cls, path, options)
+
+    def withTimeout(self, timeout = None, total = None):
+        if self._timeout_override is None:
+            raise TelerivetException("AsyncAPI.withTimeout requires Python 3.7 or higher")
+        return API.withTimeout(self, timeout, total)
+
+    def hydrate(self, entities, max_workers = 8):
+        raise TelerivetException("Entities created via AsyncAPI must be loaded with 'await tr.hydrate(entities)'")
+
+class _PendingRequest(BaseException):
+    # Derived from BaseException so that it is not caught by 'except Exception' in client methods.
+
+    def __init__(self, request):
+        BaseException.__init__(self)
+        self.request = request
+
+_NO_REQUEST_PREFIXES = ('init', 'query')
+
+# methods that send requests from worker threads, which cannot be suspended by AsyncAPI._call
+_UNSUPPORTED_METHODS = {
+    'sendMultiBulk': "send each batch with 'await project.sendMulti(...)' instead, e.g. using asyncio.gather",
+    'importContactsStream': "import each batch with 'await project.importContacts(...)' instead, e.g. using asyncio.gather",
+}
+
+_SYNC_METHODS = frozenset(['getBaseApiPath', 'newApiCursor', 'createSession', 'getSession', 'getRetryDelay', 'getResponseBytesReceived', 'sendRequest', 'addHook', 'fireHook', 'isInstrumented', 'startRequest', 'recordRequest', 'recordPage', 'sendApiRequest', 'getRequestTimeout', 'withTimeout', 'overrideTimeout', 'bindTimeoutOverride', 'isConnectionError', 'getUrlParams', 'encodeParamsRec', 'prepareRequest', 'parseResponse', 'parseCachedResponse'])
@@ -196,6 +196,8 @@ class Broadcast(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def cancel(self):
         """
         Cancels sending a broadcast that has not yet been completely sent. No additional messages
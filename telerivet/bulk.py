@@ -0,0 +1,60 @@
+import collections
+import itertools
+
+def iterBatches(iterable, batch_size):
+    """
+    Splits an iterable into lists of up to batch_size items, without reading more than one batch
+    of the iterable into memory at a time.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def mapBatches(func, batches, max_workers, ordered = True):
+    """
+    Calls func(batch) for each batch using a pool of up to max_workers threads, and yields
+    (batch, result) tuples.
+
+    If ordered is true, results are yielded in the same order as the
+    batches; otherwise they are yielded as soon as they are available. At most 2 * max_workers
+    batches are read from the batches iterable before their results are yielded, so the
+    iterable may be arbitrarily long. If func raises an exception, it is raised to the caller
+    and batches that have not been started yet are cancelled.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    max_pending = max_workers * 2
+    executor = ThreadPoolExecutor(max_workers)
+    pending = collections.OrderedDict()
+
+    try:
+        batches = iter(batches)
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    batch = next(batches)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(func, batch)] = batch
+
+            if not pending:
+                return
+
+            if ordered:
+                future = next(iter(pending))
+            else:
+                done, not_done = wait(pending, return_when = FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+
+            batch = pending.pop(future)
+            yield batch, future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait = True)
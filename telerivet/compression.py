@@ -0,0 +1,93 @@
+import threading
+import zlib
+
+def compress(data, encoding, level = None):
+    """
+    Compresses a request body with the given content encoding ('gzip', 'br', or 'zstd').
+    Brotli and Zstandard compression require the brotli or zstandard module.
+    """
+    if encoding == 'gzip':
+        gzip_compress = zlib.compressobj(-1 if level is None else level, zlib.DEFLATED, zlib.MAX_WBITS | 16) # add gzip header
+        return gzip_compress.compress(data) + gzip_compress.flush()
+    elif encoding == 'br':
+        import brotli
+        return brotli.compress(data, quality = 4 if level is None else level)
+    elif encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level = 3 if level is None else level).compress(data)
+    else:
+        raise ValueError("Unsupported compression: %s" % encoding)
+
+class CompressionStats(object):
+    """
+    Counts the number of bytes of API requests and responses before and after compression.
+
+    Available as the `compression_stats` property of telerivet.API.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Resets all counters to zero.
+        """
+        with self._lock:
+            self.request_bytes = 0
+            self.request_bytes_sent = 0
+            self.requests_compressed = 0
+            self.response_bytes = 0
+            self.response_bytes_received = 0
+
+    def addRequest(self, num_bytes, num_bytes_sent):
+        with self._lock:
+            self.request_bytes += num_bytes
+            self.request_bytes_sent += num_bytes_sent
+            if num_bytes_sent != num_bytes:
+                self.requests_compressed += 1
+
+    def addResponse(self, num_bytes, num_bytes_received):
+        with self._lock:
+            self.response_bytes += num_bytes
+            self.response_bytes_received += num_bytes_received
+
+    def getRequestRatio(self):
+        """
+        Returns the ratio of uncompressed request body bytes to bytes sent (1.0 if no request
+        bodies have been sent).
+
+        Returns:
+            float
+        """
+        if self.request_bytes_sent == 0:
+            return 1.0
+        return self.request_bytes / float(self.request_bytes_sent)
+
+    def getResponseRatio(self):
+        """
+        Returns the ratio of decompressed response body bytes to bytes received (1.0 if no
+        responses have been received).
+
+        Returns:
+            float
+        """
+        if self.response_bytes_received == 0:
+            return 1.0
+        return self.response_bytes / float(self.response_bytes_received)
+
+    def asDict(self):
+        """
+        Returns all counters in a dict.
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            return {
+                'request_bytes': self.request_bytes,
+                'request_bytes_sent': self.request_bytes_sent,
+                'requests_compressed': self.requests_compressed,
+                'response_bytes': self.response_bytes,
+                'response_bytes_received': self.response_bytes_received,
+            }
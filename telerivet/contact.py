@@ -86,6 +86,8 @@ class Contact(Entity):
           * Read-only
     """
 
+    __slots__ = ('_group_ids_set',)
+
     def isInGroup(self, group):
         """
         Returns true if this contact is in a particular group, false otherwise.
@@ -98,7 +100,7 @@ class Contact(Entity):
             bool
         """
         self.load()
-        return group.id in self._group_ids_set
+        return group.id in self._getGroupIdsSet()
 
     def addToGroup(self, group):
         """
@@ -110,7 +112,7 @@ class Contact(Entity):
         """
 
         self._api.doRequest("PUT", group.getBaseApiPath() + "/contacts/" + self.id);
-        self._group_ids_set[group.id] = True
+        self._getGroupIdsSet()[group.id] = True
 
     def removeFromGroup(self, group):
         """
@@ -122,8 +124,9 @@ class Contact(Entity):
         """
 
         self._api.doRequest("DELETE", group.getBaseApiPath() + "/contacts/" + self.id)
-        if group.id in self._group_ids_set:
-            del self._group_ids_set[group.id]
+        group_ids_set = self._getGroupIdsSet()
+        if group.id in group_ids_set:
+            del group_ids_set[group.id]
 
     def queryMessages(self, **options):
         """
@@ -381,8 +384,16 @@ class Contact(Entity):
     def _setData(self, data):
         super(Contact, self)._setData(data)
 
-        self._group_ids_set = {}
+        self._group_ids_set = None
+
+    def _getGroupIdsSet(self):
+        # built on first use, since most contacts never call isInGroup
+        if self._group_ids_set is None:
+            self._group_ids_set = {}
+
+            data = self._data
+            if 'group_ids' in data:
+                for group_id in data['group_ids']:
+                    self._group_ids_set[group_id] = True
 
-        if 'group_ids' in data:
-            for group_id in data['group_ids']:
-                self._group_ids_set[group_id] = True
+        return self._group_ids_set
@@ -62,6 +62,8 @@ class ContactServiceState(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def save(self):
         """
         Saves the state id and any custom variables for this contact. If the state id is null, this
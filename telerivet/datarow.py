@@ -54,6 +54,8 @@ class DataRow(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def save(self):
         """
         Saves any fields or custom variables that have changed for this data row.
@@ -54,6 +54,8 @@ class DataTable(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def queryRows(self, **options):
         """
         Queries rows in this data table.
@@ -136,7 +138,7 @@ class DataTable(Entity):
             DataRow
         """
         from .datarow import DataRow
-        return DataRow(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/rows/%s" % (id)))
+        return DataRow(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/rows/%s" % (id), cache_entity = True))
 
     def initRowById(self, id):
         """
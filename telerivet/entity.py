@@ -1,30 +1,41 @@
 
 class Entity(object):    
+    # Entities only allocate _dirty when a field is first modified, and use __slots__ instead of
+    # a per-instance __dict__, to minimize memory use when many entities are kept in memory.
+    __slots__ = ('_api', '_vars', '_dirty', '_data', '_is_loaded')
+
     def __init__(self, api, data, is_loaded = True):    
         self._api = api
         self._vars = None
-        self._dirty = {}
+        self._dirty = None
         self._data = {}
+        self._is_loaded = is_loaded
         self._setData(data)
-        self._is_loaded = is_loaded        
     
     def _setData(self, data):
         self._data = data
-        
-        if 'vars' in data:            
-            self._vars = CustomVars(data['vars'])
-        else:
-            self._vars = CustomVars({})    
+        self._vars = None
     
     def load(self):    
         if not self._is_loaded:
-            self._is_loaded = True
-            self._setData(self._api.doRequest('GET', self.getBaseApiPath()))            
+            self._setLoadedData(self._api.doRequest('GET', self.getBaseApiPath(), cache_entity = True))
+
+    def _setLoadedData(self, data):
+        self._setData(data)
+        self._is_loaded = True
+        if self._dirty:
             self._data.update(self._dirty)
         
     def __getattr__(self, name):    
+        if name.startswith('_'):
+            raise AttributeError(name)
+
         if name == 'vars':
             self.load()
+            if self._vars is None:
+                # CustomVars is only created when vars are first accessed
+                data = self._data
+                self._vars = CustomVars(data['vars'] if 'vars' in data else {})
             return self._vars
         
         data = self._data
@@ -43,15 +54,17 @@ class Entity(object):
     
     def __setattr__(self, name, value):
         if name.startswith('_'):
-            self.__dict__[name] = value
+            object.__setattr__(self, name, value)
             return
             
         self._data[name] = value
+        if self._dirty is None:
+            self._dirty = {}
         self._dirty[name] = value
     
     def save(self):
     
-        dirty_props = self._dirty
+        dirty_props = self._dirty if self._dirty is not None else {}
 
         if self._vars is not None:
             dirty_vars = self._vars.getDirtyVariables()
@@ -59,7 +72,7 @@ class Entity(object):
                 dirty_props['vars'] = dirty_vars
             
         self._api.doRequest('POST', self.getBaseApiPath(), dirty_props)
-        self._dirty = {}
+        self._dirty = None
         
         if self._vars is not None:
             self._vars.clearDirtyVariables()
@@ -69,29 +82,35 @@ class Entity(object):
         if not self._is_loaded:
             res += " (not loaded)";
 
-        import json
-        res += " JSON: " + json.dumps(self._data)
+        res += " JSON: " + self._api.json_codec.encode(self._data).decode('utf-8')
         
         return res
     
     def getBaseApiPath(self):
         abstract
 
-class CustomVars:
+class CustomVars(object):
+    __slots__ = ('_vars', '_dirty')
+
     def __init__(self, vars):
         self._vars = vars
-        self._dirty = {}
+        self._dirty = None
     
     def all(self):
         return self._vars
     
     def getDirtyVariables(self):
+        if self._dirty is None:
+            return {}
         return self._dirty
     
     def clearDirtyVariables(self):
-        self._dirty = {}
+        self._dirty = None
         
     def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
         if name in self._vars:
             return self._vars[name]
         else:
@@ -99,8 +118,10 @@ class CustomVars:
     
     def __setattr__(self, name, value):
         if name.startswith('_'):
-            self.__dict__[name] = value
+            object.__setattr__(self, name, value)
             return
             
         self._vars[name] = value
+        if self._dirty is None:
+            self._dirty = {}
         self._dirty[name] = value
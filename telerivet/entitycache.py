@@ -0,0 +1,128 @@
+import threading
+import time
+
+from collections import OrderedDict
+
+class EntityCache(object):
+    """
+    Caches API responses for individual objects (e.g. the responses of `getContactById`,
+    `getPhoneById`, or `Entity.load()`), so that repeated lookups of the same object do not send
+    another API request until the cached response expires.
+
+    Only responses of methods that fetch a single object by ID (the get*ById
+    methods, `Entity.load()` and `API.hydrate()`) are cached. Entries are invalidated when a
+    POST, PUT or DELETE request whose path refers to the same object (e.g. `save()` or
+    `delete()`) is sent through an API handle using the cache.
+    Changes made in other ways (e.g. via the Telerivet web app, or by another process) are not
+    visible until the entry expires, so `ttl` should be chosen according to how stale the data
+    may be.
+
+    Each lookup returns a new copy of the cached response, so modifying an
+    entity does not modify the cache.
+
+    Example:
+
+        tr = telerivet.API(API_KEY, entity_cache = telerivet.EntityCache(max_size = 500, ttl = 30))
+
+    Arguments:
+      - max_size (int)
+          * Maximum number of responses to cache; the least recently used responses are removed
+              first
+          * Default: 1000
+
+      - ttl (float)
+          * Number of seconds after which cached responses expire
+          * Default: 60
+    """
+
+    def __init__(self, max_size = 1000, ttl = 60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._paths_by_id = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, path, codec):
+        """
+        Returns a copy of the cached response for the given path, or None if it is not cached or
+        has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                expire_time, content = entry
+                if expire_time > time.time():
+                    # move to the end, as the most recently used entry
+                    del self._entries[path]
+                    self._entries[path] = entry
+                    self.hits += 1
+                    return codec.decode(content)
+
+                self.removeEntry(path)
+            self.misses += 1
+            return None
+
+    def put(self, path, res, codec):
+        content = codec.encode(res)
+        with self._lock:
+            if path in self._entries:
+                del self._entries[path]
+            else:
+                object_id = path.rsplit('/', 1)[-1]
+                self._paths_by_id.setdefault(object_id, set()).add(path)
+
+            self._entries[path] = (time.time() + self.ttl, content)
+
+            while len(self._entries) > self.max_size:
+                self.removeEntry(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, path):
+        """
+        Removes cached responses for all objects whose ID appears in the given request path.
+        """
+        with self._lock:
+            for part in path.split('/'):
+                paths = self._paths_by_id.get(part)
+                if paths:
+                    for cached_path in list(paths):
+                        self.removeEntry(cached_path)
+                        self.invalidations += 1
+
+    def removeEntry(self, path):
+        del self._entries[path]
+
+        object_id = path.rsplit('/', 1)[-1]
+        paths = self._paths_by_id[object_id]
+        paths.discard(path)
+        if not paths:
+            del self._paths_by_id[object_id]
+
+    def clear(self):
+        """
+        Removes all cached responses.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._paths_by_id.clear()
+
+    def asDict(self):
+        """
+        Returns the number of cached responses and the number of hits, misses, evictions and
+        invalidations.
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
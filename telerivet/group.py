@@ -51,6 +51,8 @@ class Group(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def queryContacts(self, **options):
         """
         Queries contacts that are members of the given group.
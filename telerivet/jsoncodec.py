@@ -0,0 +1,86 @@
+import json
+
+class JSONCodec(object):
+    """
+    Encodes API request bodies and decodes API responses using Python's standard json module.
+
+    Subclasses use faster JSON libraries if they are installed. To use a
+    custom JSON library, pass an object with `encode` and `decode` methods as the `json_codec`
+    option of telerivet.API.
+    """
+
+    name = 'json'
+
+    def encode(self, obj):
+        """
+        Returns the JSON representation of obj as UTF-8 bytes.
+        """
+        return json.dumps(obj).encode('utf-8')
+
+    def decode(self, data):
+        """
+        Parses JSON from bytes or a string. Raises ValueError if the data is not valid JSON.
+        """
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+class OrjsonCodec(JSONCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, obj):
+        try:
+            return self._orjson.dumps(obj, option = self._options)
+        except TypeError:
+            # orjson does not support some values that the json module accepts, such as
+            # integers larger than 64 bits
+            return JSONCodec.encode(self, obj)
+
+    def decode(self, data):
+        return self._orjson.loads(data)
+
+class UjsonCodec(JSONCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def encode(self, obj):
+        return self._ujson.dumps(obj).encode('utf-8')
+
+    def decode(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return self._ujson.loads(data)
+
+_CODEC_CLASSES = {
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'json': JSONCodec,
+}
+
+def getJSONCodec(codec = None):
+    """
+    Returns a JSON codec. If codec is None, returns the fastest codec whose library is installed
+    (orjson, then ujson, then the standard json module). If codec is a name ('orjson', 'ujson',
+    or 'json'), returns that codec, raising ImportError if its library is not installed.
+    Otherwise, codec is returned unchanged.
+    """
+    if codec is None:
+        for cls in (OrjsonCodec, UjsonCodec):
+            try:
+                return cls()
+            except ImportError:
+                pass
+        return JSONCodec()
+
+    if codec in _CODEC_CLASSES:
+        return _CODEC_CLASSES[codec]()
+
+    return codec
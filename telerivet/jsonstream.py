@@ -0,0 +1,110 @@
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+
+_WHITESPACE = ' \t\n\r'
+
+_NUMBER_CONTINUATION = '.eE+-'
+
+class JSONArrayStream(object):
+    """
+    Incrementally parses a JSON object read from an iterable of byte strings, yielding each item
+    of the array property named `array_key` as soon as it has been read, without buffering the
+    entire object in memory.
+
+    After all items have been yielded, `result` contains the other
+    properties of the object. Raises ValueError if the input is not valid JSON.
+    """
+
+    def __init__(self, chunks, array_key):
+        self.chunks = iter(chunks)
+        self.array_key = array_key
+        self.result = None
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        array_key = self.array_key
+        result = {}
+
+        self.readChar('{')
+        if self.peekChar() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = self.readValue()
+                self.readChar(':')
+
+                if key == array_key and self.peekChar() == '[':
+                    self._pos += 1
+                    if self.peekChar() == ']':
+                        self._pos += 1
+                    else:
+                        while True:
+                            yield self.readValue()
+                            if self.readChar(',]') == ']':
+                                break
+                else:
+                    result[key] = self.readValue()
+
+                if self.readChar(',}') == '}':
+                    break
+
+        if self.peekChar() is not None:
+            raise ValueError("Extra data after JSON object")
+
+        self.result = result
+
+    def fill(self):
+        for chunk in self.chunks:
+            if chunk:
+                self._buf = self._buf[self._pos:] + self._text_decoder.decode(chunk)
+                self._pos = 0
+                return True
+
+        if not self._eof:
+            self._buf = self._buf[self._pos:] + self._text_decoder.decode(b'', True)
+            self._pos = 0
+            self._eof = True
+        return False
+
+    def peekChar(self):
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill() and self._pos >= len(self._buf):
+                return None
+
+    def readChar(self, expected):
+        c = self.peekChar()
+        if c is None or c not in expected:
+            raise ValueError("Expected one of %r in JSON at position %d" % (expected, self._pos))
+        self._pos += 1
+        return c
+
+    def readValue(self):
+        self.peekChar()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+            else:
+                # a value that ends at the end of the buffer (e.g. a number) may be incomplete, as
+                # may a number followed by a character that it could continue with (e.g. '1.' or
+                # '1e' at the end of a chunk is parsed as 1)
+                if self._eof or (end < len(self._buf) and not (self._buf[end] in _NUMBER_CONTINUATION and isinstance(value, (int, float)))):
+                    self._pos = end
+                    return value
+
+            self.fill()
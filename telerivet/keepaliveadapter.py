@@ -0,0 +1,32 @@
+import socket
+
+from requests.adapters import HTTPAdapter
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that enables TCP keep-alive on each connection, sending keep-alive probes after
+    the connection has been idle for `idle` seconds (where supported by the operating system).
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['idle']
+
+    def __init__(self, idle, **kwargs):
+        self.idle = idle
+        super(KeepAliveAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        from requests.packages.urllib3.connection import HTTPConnection
+
+        socket_options = list(HTTPConnection.default_socket_options)
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.idle))
+        elif hasattr(socket, 'TCP_KEEPALIVE'): # macOS
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, self.idle))
+
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, self.idle // 4)))
+
+        kwargs['socket_options'] = socket_options
+        super(KeepAliveAdapter, self).init_poolmanager(*args, **kwargs)
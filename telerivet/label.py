@@ -33,6 +33,8 @@ class Label(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def queryMessages(self, **options):
         """
         Queries messages with the given label.
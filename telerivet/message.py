@@ -243,6 +243,8 @@ class Message(Entity):
           * Read-only
     """
 
+    __slots__ = ('_label_ids_set',)
+
     def hasLabel(self, label):
         """
         Returns true if this message has a particular label, false otherwise.
@@ -256,7 +258,7 @@ class Message(Entity):
         """
     
         self.load()
-        return label.id in self._label_ids_set
+        return label.id in self._getLabelIdsSet()
       
     def addLabel(self, label):
         """
@@ -268,7 +270,7 @@ class Message(Entity):
         """
         
         self._api.doRequest("PUT", label.getBaseApiPath() + "/messages/" + self.id);
-        self._label_ids_set[label.id] = True
+        self._getLabelIdsSet()[label.id] = True
     
     def removeLabel(self, label):
         """
@@ -280,8 +282,9 @@ class Message(Entity):
         """
     
         self._api.doRequest("DELETE", label.getBaseApiPath() + "/messages/" + self.id)
-        if label.id in self._label_ids_set:
-            del self._label_ids_set[label.id]
+        label_ids_set = self._getLabelIdsSet()
+        if label.id in label_ids_set:
+            del label_ids_set[label.id]
 
     def delete(self):    
         """
@@ -352,9 +355,16 @@ class Message(Entity):
     def _setData(self, data):    
         super(Message, self)._setData(data)
         
-        self._label_ids_set = {}
-        
-        if 'label_ids' in data:
-            for label_id in data['label_ids']:            
-                self._label_ids_set[label_id] = True
-    
\ No newline at end of file
+        self._label_ids_set = None
+
+    def _getLabelIdsSet(self):
+        # built on first use, since most messages never call hasLabel
+        if self._label_ids_set is None:
+            self._label_ids_set = {}
+
+            data = self._data
+            if 'label_ids' in data:
+                for label_id in data['label_ids']:
+                    self._label_ids_set[label_id] = True
+
+        return self._label_ids_set
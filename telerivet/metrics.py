@@ -0,0 +1,232 @@
+import re
+import threading
+
+_ID_ACTIONS = frozenset(['send', 'send_batch', 'receive'])
+
+_STATSD_INVALID_CHARS = re.compile(r'[^A-Za-z0-9_]+')
+
+def getEndpointName(path):
+    """
+    Returns the path of an API request with object IDs replaced by '{id}', e.g.
+    '/projects/{id}/contacts/{id}', so that requests for different objects are grouped together.
+    """
+    parts = path.split('/')
+    for i in range(2, len(parts), 2):
+        if parts[i] not in _ID_ACTIONS:
+            parts[i] = '{id}'
+    return '/'.join(parts)
+
+class _EndpointMetrics(object):
+    __slots__ = ('requests', 'errors', 'retries', 'duration_sum', 'duration_max', 'bucket_counts',
+        'bytes_sent', 'bytes_received', 'status_codes', 'pages', 'max_page_depth')
+
+    def __init__(self, num_buckets):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.duration_sum = 0.0
+        self.duration_max = 0.0
+        self.bucket_counts = [0] * num_buckets
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status_codes = {}
+        self.pages = 0
+        self.max_page_depth = 0
+
+class Metrics(object):
+    """
+    Collects metrics about the API requests sent by a client handle, grouped by HTTP method and
+    endpoint: the number of requests, errors and retries, a histogram of request latency, bytes
+    sent and received, the number of responses with each HTTP status code, and the number of
+    pages fetched by API cursors.
+
+    Enable metrics by passing `metrics = True` (or a Metrics instance, to
+    share one collector between several client handles) to telerivet.API, then read them via
+    `api.metrics`, e.g.:
+
+        tr = telerivet.API(API_KEY, metrics = True)
+        ...
+        print(tr.metrics.toPrometheus())
+
+    Arguments:
+      - buckets (array)
+          * Upper bounds in seconds of the buckets of the latency histogram
+          * Default: [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+    """
+
+    DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self, buckets = None):
+        self.buckets = tuple(sorted(buckets if buckets is not None else Metrics.DEFAULT_BUCKETS))
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def reset(self):
+        """
+        Removes all collected metrics.
+        """
+        with self._lock:
+            self._endpoints = {}
+
+    def getEndpoint(self, method, endpoint):
+        key = (method, endpoint)
+        endpoint_metrics = self._endpoints.get(key)
+        if endpoint_metrics is None:
+            endpoint_metrics = self._endpoints[key] = _EndpointMetrics(len(self.buckets))
+        return endpoint_metrics
+
+    def recordRequest(self, info):
+        """
+        Records a request attempt, where info is the dict passed to the 'after_response' and
+        'on_error' hooks of telerivet.API.
+        """
+        duration = info['duration']
+        status_code = info.get('status_code')
+
+        with self._lock:
+            m = self.getEndpoint(info['method'], info['endpoint'])
+            m.requests += 1
+            m.duration_sum += duration
+            if duration > m.duration_max:
+                m.duration_max = duration
+
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    m.bucket_counts[i] += 1
+                    break
+
+            m.bytes_sent += info.get('bytes_sent', 0)
+            m.bytes_received += info.get('bytes_received', 0)
+
+            status = str(status_code) if status_code is not None else 'none'
+            m.status_codes[status] = m.status_codes.get(status, 0) + 1
+
+            if info.get('error') is not None:
+                m.errors += 1
+            if info.get('will_retry'):
+                m.retries += 1
+
+    def recordPage(self, method, endpoint, page_number):
+        """
+        Records that an API cursor fetched a page of results, where page_number is 1 for the first
+        page of a query.
+        """
+        with self._lock:
+            m = self.getEndpoint(method, endpoint)
+            m.pages += 1
+            if page_number > m.max_page_depth:
+                m.max_page_depth = page_number
+
+    def asDict(self):
+        """
+        Returns the collected metrics, as a dict mapping 'METHOD /endpoint' to a dict of metrics
+        for that endpoint.
+
+        Returns:
+            dict
+        """
+        res = {}
+        with self._lock:
+            for (method, endpoint), m in self._endpoints.items():
+                res['%s %s' % (method, endpoint)] = {
+                    'requests': m.requests,
+                    'errors': m.errors,
+                    'retries': m.retries,
+                    'duration_sum': m.duration_sum,
+                    'duration_max': m.duration_max,
+                    'duration_buckets': dict(zip(self.buckets, m.bucket_counts)),
+                    'bytes_sent': m.bytes_sent,
+                    'bytes_received': m.bytes_received,
+                    'status_codes': dict(m.status_codes),
+                    'pages': m.pages,
+                    'max_page_depth': m.max_page_depth,
+                }
+        return res
+
+    def toPrometheus(self, prefix = 'telerivet'):
+        """
+        Returns the collected metrics in the Prometheus text exposition format.
+
+        Returns:
+            string
+        """
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            histogram = []
+            counters = {'requests': [], 'retries': [], 'bytes_sent': [], 'bytes_received': [], 'pages': []}
+            max_page_depth = []
+
+            for (method, endpoint), m in endpoints:
+                labels = 'method="%s",endpoint="%s"' % (method, endpoint)
+
+                cumulative = 0
+                for bound, count in zip(self.buckets, m.bucket_counts):
+                    cumulative += count
+                    histogram.append('%s_request_duration_seconds_bucket{%s,le="%s"} %d' % (prefix, labels, bound, cumulative))
+                histogram.append('%s_request_duration_seconds_bucket{%s,le="+Inf"} %d' % (prefix, labels, m.requests))
+                histogram.append('%s_request_duration_seconds_sum{%s} %s' % (prefix, labels, repr(m.duration_sum)))
+                histogram.append('%s_request_duration_seconds_count{%s} %d' % (prefix, labels, m.requests))
+
+                for status, count in sorted(m.status_codes.items()):
+                    counters['requests'].append('%s_requests_total{%s,status="%s"} %d' % (prefix, labels, status, count))
+
+                counters['retries'].append('%s_retries_total{%s} %d' % (prefix, labels, m.retries))
+                counters['bytes_sent'].append('%s_bytes_sent_total{%s} %d' % (prefix, labels, m.bytes_sent))
+                counters['bytes_received'].append('%s_bytes_received_total{%s} %d' % (prefix, labels, m.bytes_received))
+
+                if m.pages:
+                    counters['pages'].append('%s_pages_total{%s} %d' % (prefix, labels, m.pages))
+                    max_page_depth.append('%s_max_page_depth{%s} %d' % (prefix, labels, m.max_page_depth))
+
+        lines = [
+            '# HELP %s_request_duration_seconds Latency of Telerivet API requests' % prefix,
+            '# TYPE %s_request_duration_seconds histogram' % prefix,
+        ] + histogram
+
+        for name, help_text in (
+                ('requests', 'Telerivet API requests by HTTP status code'),
+                ('retries', 'Telerivet API requests that were retried'),
+                ('bytes_sent', 'Bytes of request bodies sent to the Telerivet API'),
+                ('bytes_received', 'Bytes of response bodies received from the Telerivet API'),
+                ('pages', 'Pages of results fetched by API cursors')):
+            lines.append('# HELP %s_%s_total %s' % (prefix, name, help_text))
+            lines.append('# TYPE %s_%s_total counter' % (prefix, name))
+            lines.extend(counters[name])
+
+        lines.append('# HELP %s_max_page_depth Maximum number of pages fetched by one API cursor' % prefix)
+        lines.append('# TYPE %s_max_page_depth gauge' % prefix)
+        lines.extend(max_page_depth)
+
+        return "\n".join(lines) + "\n"
+
+    def toStatsd(self, prefix = 'telerivet'):
+        """
+        Returns the collected metrics as a list of StatsD gauge lines (e.g.
+        'telerivet.GET.projects.id.contacts.requests:12|g'), which can be sent to a StatsD
+        server periodically.
+
+        Returns:
+            array
+        """
+        lines = []
+        with self._lock:
+            for (method, endpoint), m in sorted(self._endpoints.items()):
+                name = '%s.%s.%s' % (prefix, method, '.'.join(_STATSD_INVALID_CHARS.sub('', part) for part in endpoint.split('/') if part))
+
+                values = [
+                    ('requests', m.requests),
+                    ('errors', m.errors),
+                    ('retries', m.retries),
+                    ('duration_avg_ms', int(1000 * m.duration_sum / m.requests) if m.requests else 0),
+                    ('duration_max_ms', int(1000 * m.duration_max)),
+                    ('bytes_sent', m.bytes_sent),
+                    ('bytes_received', m.bytes_received),
+                    ('pages', m.pages),
+                    ('max_page_depth', m.max_page_depth),
+                ]
+                values.extend(('status.%s' % status, count) for status, count in sorted(m.status_codes.items()))
+
+                for key, value in values:
+                    lines.append('%s.%s:%s|g' % (name, key, value))
+        return lines
@@ -0,0 +1,111 @@
+import threading
+import time
+
+class NameCache(object):
+    """
+    Caches the groups, labels and data tables returned by `Project.getOrCreateGroup`,
+    `getOrCreateLabel` and `getOrCreateDataTable`, by project and name, so that resolving a name
+    that has already been resolved does not send another API request.
+
+    Entries are removed when a request that updates or deletes the same
+    object (e.g. renaming or deleting a group) is sent through an API handle using the cache.
+    The cache can be filled in advance with `Project.warmNameCache()`.
+
+    Example:
+
+        tr = telerivet.API(API_KEY, name_cache = telerivet.NameCache(ttl = 600))
+
+        project = tr.initProjectById(PROJECT_ID)
+        project.warmNameCache()
+
+        group = project.getOrCreateGroup('Subscribers') # no API request
+
+    Arguments:
+      - ttl (float)
+          * Number of seconds after which cached objects expire, or None if they never expire
+          * Default: 300
+    """
+
+    def __init__(self, ttl = 300):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._keys_by_id = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, name, codec):
+        """
+        Returns a copy of the cached object with the given name in the collection at the given
+        path (e.g. '/projects/PJ123/groups'), or None if it is not cached or has expired.
+        """
+        key = (path, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expire_time, content, object_id = entry
+                if expire_time is None or expire_time > time.time():
+                    self.hits += 1
+                    return codec.decode(content)
+
+                self.removeEntry(key)
+            self.misses += 1
+            return None
+
+    def put(self, path, name, res, codec):
+        key = (path, name)
+        object_id = res.get('id')
+        content = codec.encode(res)
+
+        with self._lock:
+            if key in self._entries:
+                self.removeEntry(key)
+
+            self._entries[key] = (time.time() + self.ttl if self.ttl is not None else None, content, object_id)
+            self._keys_by_id.setdefault(object_id, set()).add(key)
+
+    def invalidate(self, method, path):
+        """
+        Removes the cached object updated or deleted by a request, i.e. a POST or DELETE request
+        whose path ends with the object's ID. Other requests that refer to the object (e.g.
+        adding a contact to a group) do not change its name, so they do not remove it.
+        """
+        if method != 'POST' and method != 'DELETE':
+            return
+
+        object_id = path.rsplit('/', 1)[-1]
+        with self._lock:
+            keys = self._keys_by_id.get(object_id)
+            if keys:
+                for key in list(keys):
+                    self.removeEntry(key)
+
+    def removeEntry(self, key):
+        expire_time, content, object_id = self._entries.pop(key)
+
+        keys = self._keys_by_id[object_id]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_id[object_id]
+
+    def clear(self):
+        """
+        Removes all cached objects.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_id.clear()
+
+    def asDict(self):
+        """
+        Returns the number of cached objects and the number of hits and misses.
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
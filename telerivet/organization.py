@@ -21,6 +21,8 @@ class Organization(Entity):
           * Updatable via API
     """
 
+    __slots__ = ()
+
     def createProject(self, **options):
         """
         Creates a new project.
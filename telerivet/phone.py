@@ -107,6 +107,8 @@ class Phone(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def queryMessages(self, **options):
         """
         Queries messages sent or received by this basic route.
@@ -56,6 +56,8 @@ class Project(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def sendMessage(self, **options):
         """
         Sends one message (SMS, MMS, chat app message, voice call, or USSD request).
@@ -181,12 +183,21 @@ class Project(Entity):
                 * The name of the text-to-speech voice (when message_type=call)
                 * Allowed values: female, male
                 * Default: female
+            
+            - idempotency_key (string)
+                * Unique key identifying this request, sent in the Idempotency-Key header. If the API
+                    handle has a send_journal, a request with the same key as a request that
+                    already completed returns the saved response instead of sending the message again.
+                    Requests without a key are not recorded in the send_journal.
           
         Returns:
             Message
         """
         from .message import Message
-        return Message(self._api, self._api.doRequest("POST", self.getBaseApiPath() + "/messages/send", options))
+
+        idempotency_key = options.pop('idempotency_key', None)
+
+        return Message(self._api, self._api.doRequest("POST", self.getBaseApiPath() + "/messages/send", options, idempotency_key = idempotency_key))
 
     def sendBroadcast(self, **options):
         """
@@ -428,6 +439,12 @@ class Project(Entity):
                 * Set to true to test the Telerivet API without actually sending a message from the
                     route
                 * Default: false
+            
+            - idempotency_key (string)
+                * Unique key identifying this request, sent in the Idempotency-Key header. If the API
+                    handle has a send_journal, a request with the same key as a request that
+                    already completed returns the saved response instead of sending the messages again.
+                    Requests without a key are not recorded in the send_journal.
           
         Returns:
             (associative array)
@@ -448,9 +465,81 @@ class Project(Entity):
                   * ID of broadcast that these messages are associated with, if `broadcast_id` or
                       `broadcast_title` parameter is provided in the API request.
         """
-        data = self._api.doRequest("POST", self.getBaseApiPath() + "/send_multi", options)
+        idempotency_key = options.pop('idempotency_key', None)
+
+        data = self._api.doRequest("POST", self.getBaseApiPath() + "/send_multi", options, idempotency_key = idempotency_key)
         return data
 
+    def sendMultiBulk(self, messages, max_workers = 4, batch_size = 100, **options):
+        """
+        Sends any number of different messages by splitting them into batches of up to 100
+        messages and calling sendMulti for each batch, using up to `max_workers` concurrent API
+        requests.
+        
+        The `messages` iterable is read incrementally as batches are sent, so
+        it may be a generator producing millions of messages without holding them all in memory.
+        
+        If the `broadcast_title` parameter is provided, the first batch is
+        sent before any other batches, and the `broadcast_id` from its response is passed to all
+        subsequent batches so that all messages are associated with the same broadcast.
+        
+        Arguments:
+            - messages (iterable)
+                * Iterable of objects with `content` and `to_number` properties, in the same format
+                    as the `messages` parameter of sendMulti
+                * Required
+            
+            - max_workers (int)
+                * Maximum number of sendMulti API requests to send concurrently
+                * Default: 4
+            
+            - batch_size (int)
+                * Number of messages to send in each API request (max 100)
+                * Default: 100
+            
+            - idempotency_key (string)
+                * If provided, each batch is sent with the idempotency key `{idempotency_key}-{n}`,
+                    where n is the index of the batch, so that restarting the same job with a
+                    send_journal does not resend batches that were already sent. Batches sent
+                    without a key are not recorded in the send_journal.
+            
+            - (all other parameters of sendMulti, which are applied to every batch)
+          
+        Returns:
+            iterator of objects with the `id` and `status` properties (and optionally
+            `error_message`) for each message, in the same order as the `messages` iterable, in
+            the same format as the items of the `messages` array returned by sendMulti
+        """
+        from .bulk import iterBatches, mapBatches
+
+        batches = enumerate(iterBatches(messages, batch_size))
+        idempotency_key = options.pop('idempotency_key', None)
+
+        def send_batch(indexed_batch):
+            index, batch = indexed_batch
+            batch_options = options.copy()
+            batch_options['messages'] = batch
+            if idempotency_key is not None:
+                batch_options['idempotency_key'] = '%s-%d' % (idempotency_key, index)
+            return self.sendMulti(**batch_options)
+
+        if options.get('broadcast_title') is not None and options.get('broadcast_id') is None:
+            first_batch = next(batches, None)
+            if first_batch is None:
+                return
+
+            res = send_batch(first_batch)
+            for message in res['messages']:
+                yield message
+
+            options = options.copy()
+            del options['broadcast_title']
+            options['broadcast_id'] = res['broadcast_id']
+
+        for batch, res in mapBatches(self._api.bindTimeoutOverride(send_batch), batches, max_workers):
+            for message in res['messages']:
+                yield message
+
     def sendMessages(self, **options):
         """
         (Deprecated) Send a message a to group or a list of phone numbers.
@@ -958,6 +1047,92 @@ class Project(Entity):
         data = self._api.doRequest("POST", self.getBaseApiPath() + "/import_contacts", options)
         return data
 
+    def importContactsStream(self, contacts, concurrency = 4, batch_size = 200, max_retries = 2, **options):
+        """
+        Creates and/or updates any number of contacts by splitting them into batches of up to 200
+        contacts and calling importContacts for each batch, using up to `concurrency` concurrent
+        API requests.
+        
+        The `contacts` iterable is read incrementally as batches are imported,
+        so it may be a generator producing millions of contacts without holding them all in
+        memory. Results are returned as soon as each batch is imported, so they are not
+        necessarily in the same order as the `contacts` iterable.
+        
+        If a batch fails due to a network error or an unexpected response from
+        the API, it will be retried up to `max_retries` times. Errors returned by the API (such
+        as invalid parameters) are raised immediately. However, a batch that may already have
+        been imported (e.g. after a read timeout) is only retried if every contact in it has a
+        value for `lookup_key`, since importing it again would create duplicates of any contacts
+        that cannot be looked up.
+        
+        Arguments:
+            - contacts (iterable)
+                * Iterable of objects in the same format as the `contacts` parameter of
+                    importContacts
+                * Required
+            
+            - concurrency (int)
+                * Maximum number of importContacts API requests to send concurrently
+                * Default: 4
+            
+            - batch_size (int)
+                * Number of contacts to import in each API request (max 200)
+                * Default: 200
+            
+            - max_retries (int)
+                * Maximum number of times to retry a batch that failed due to a network error
+                * Default: 2
+            
+            - (all other parameters of importContacts, such as `lookup_key`, which are applied
+                to every batch)
+          
+        Returns:
+            iterator of (input_index, contact_id) tuples, where input_index is the position of
+            the contact in the `contacts` iterable
+        """
+        import time
+        from .bulk import iterBatches, mapBatches
+
+        lookup_key = options.get('lookup_key', 'phone_number')
+
+        def has_lookup_value(contact):
+            if lookup_key == 'none':
+                return False
+            if lookup_key.startswith('vars.'):
+                value = (contact.get('vars') or {}).get(lookup_key[5:])
+            else:
+                value = contact.get(lookup_key)
+            return value is not None and value != ''
+
+        def import_batch(indexed_batch):
+            batch = indexed_batch[1]
+            batch_options = options.copy()
+            batch_options['contacts'] = batch
+
+            # contacts without a lookup value are always created, so retrying a batch that may
+            # already have been imported is only safe if every contact can be looked up
+            retry_processed = all(has_lookup_value(contact) for contact in batch)
+
+            attempt = 0
+            while True:
+                try:
+                    return self.importContacts(**batch_options)
+                except IOError as e:
+                    if attempt >= max_retries or not (retry_processed or self._api.isConnectionError(e)):
+                        raise
+                    attempt += 1
+                    time.sleep(attempt)
+
+        def indexed_batches():
+            start_index = 0
+            for batch in iterBatches(contacts, batch_size):
+                yield start_index, batch
+                start_index += len(batch)
+
+        for (start_index, batch), res in mapBatches(self._api.bindTimeoutOverride(import_batch), indexed_batches(), concurrency, ordered = False):
+            for i, contact in enumerate(res['contacts']):
+                yield start_index + i, contact['id']
+
     def queryContacts(self, **options):
         """
         Queries contacts within the given project.
@@ -1053,7 +1228,7 @@ class Project(Entity):
             Contact
         """
         from .contact import Contact
-        return Contact(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/contacts/%s" % (id)))
+        return Contact(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/contacts/%s" % (id), cache_entity = True))
 
     def initContactById(self, id):
         """
@@ -1129,7 +1304,7 @@ class Project(Entity):
             Phone
         """
         from .phone import Phone
-        return Phone(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/phones/%s" % (id)))
+        return Phone(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/phones/%s" % (id), cache_entity = True))
 
     def initPhoneById(self, id):
         """
@@ -1242,7 +1417,7 @@ class Project(Entity):
             Message
         """
         from .message import Message
-        return Message(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/messages/%s" % (id)))
+        return Message(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/messages/%s" % (id), cache_entity = True))
 
     def initMessageById(self, id):
         """
@@ -1314,7 +1489,7 @@ class Project(Entity):
             Broadcast
         """
         from .broadcast import Broadcast
-        return Broadcast(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/broadcasts/%s" % (id)))
+        return Broadcast(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/broadcasts/%s" % (id), cache_entity = True))
 
     def initBroadcastById(self, id):
         """
@@ -1594,7 +1769,7 @@ class Project(Entity):
             Task
         """
         from .task import Task
-        return Task(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/tasks/%s" % (id)))
+        return Task(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/tasks/%s" % (id), cache_entity = True))
 
     def initTaskById(self, id):
         """
@@ -1662,7 +1837,7 @@ class Project(Entity):
             Group
         """
         from .group import Group
-        return Group(self._api, self._api.doRequest("POST", self.getBaseApiPath() + "/groups", {'name': name}))
+        return Group(self._api, self.getOrCreateByName("/groups", name))
 
     def getGroupById(self, id):
         """
@@ -1677,7 +1852,7 @@ class Project(Entity):
             Group
         """
         from .group import Group
-        return Group(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/groups/%s" % (id)))
+        return Group(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/groups/%s" % (id), cache_entity = True))
 
     def initGroupById(self, id):
         """
@@ -1742,7 +1917,7 @@ class Project(Entity):
             Label
         """
         from .label import Label
-        return Label(self._api, self._api.doRequest("POST", self.getBaseApiPath() + "/labels", {'name': name}))
+        return Label(self._api, self.getOrCreateByName("/labels", name))
 
     def getLabelById(self, id):
         """
@@ -1757,7 +1932,7 @@ class Project(Entity):
             Label
         """
         from .label import Label
-        return Label(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/labels/%s" % (id)))
+        return Label(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/labels/%s" % (id), cache_entity = True))
 
     def initLabelById(self, id):
         """
@@ -1822,7 +1997,7 @@ class Project(Entity):
             DataTable
         """
         from .datatable import DataTable
-        return DataTable(self._api, self._api.doRequest("POST", self.getBaseApiPath() + "/tables", {'name': name}))
+        return DataTable(self._api, self.getOrCreateByName("/tables", name))
 
     def getDataTableById(self, id):
         """
@@ -1837,7 +2012,7 @@ class Project(Entity):
             DataTable
         """
         from .datatable import DataTable
-        return DataTable(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/tables/%s" % (id)))
+        return DataTable(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/tables/%s" % (id), cache_entity = True))
 
     def initDataTableById(self, id):
         """
@@ -1956,7 +2131,7 @@ class Project(Entity):
             ScheduledMessage
         """
         from .scheduledmessage import ScheduledMessage
-        return ScheduledMessage(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/scheduled/%s" % (id)))
+        return ScheduledMessage(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/scheduled/%s" % (id), cache_entity = True))
 
     def initScheduledMessageById(self, id):
         """
@@ -1986,7 +2161,7 @@ class Project(Entity):
             RelativeScheduledMessage
         """
         from .relativescheduledmessage import RelativeScheduledMessage
-        return RelativeScheduledMessage(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/relative_scheduled/%s" % (id)))
+        return RelativeScheduledMessage(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/relative_scheduled/%s" % (id), cache_entity = True))
 
     def initRelativeScheduledMessageById(self, id):
         """
@@ -2202,7 +2377,7 @@ class Project(Entity):
             Service
         """
         from .service import Service
-        return Service(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/services/%s" % (id)))
+        return Service(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/services/%s" % (id), cache_entity = True))
 
     def initServiceById(self, id):
         """
@@ -2373,7 +2548,7 @@ class Project(Entity):
             Route
         """
         from .route import Route
-        return Route(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/routes/%s" % (id)))
+        return Route(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/routes/%s" % (id), cache_entity = True))
 
     def initRouteById(self, id):
         """
@@ -2459,7 +2634,7 @@ class Project(Entity):
             AirtimeTransaction
         """
         from .airtimetransaction import AirtimeTransaction
-        return AirtimeTransaction(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/airtime_transactions/%s" % (id)))
+        return AirtimeTransaction(self._api, self._api.doRequest("GET", self.getBaseApiPath() + "/airtime_transactions/%s" % (id), cache_entity = True))
 
     def initAirtimeTransactionById(self, id):
         """
@@ -2669,5 +2844,82 @@ class Project(Entity):
         """
         super(Project, self).save()
 
+    def loadAll(self, entities, max_workers = 8):
+        """
+        Loads the data of many entities in this project that were initialized without being
+        loaded (e.g. via `initContactById` or `initMessageById`), using concurrent requests. See
+        API.hydrate.
+        
+        Arguments:
+          - entities (array)
+              * Entities to load
+              * Required
+          
+          - max_workers (int)
+              * Maximum number of requests sent concurrently
+              * Default: 8
+        
+        Returns:
+            array (the entities)
+        """
+        return self._api.hydrate(entities, max_workers)
+
+    def warmNameCache(self, groups = True, labels = True, data_tables = True):
+        """
+        Adds all groups, labels and/or data tables in the project to the API handle's name cache,
+        so that later calls to getOrCreateGroup, getOrCreateLabel and getOrCreateDataTable with
+        their names do not send API requests.
+        
+        Arguments:
+          - groups (bool)
+              * Default: true
+          
+          - labels (bool)
+              * Default: true
+          
+          - data_tables (bool)
+              * Default: true
+        
+        Returns:
+            int (the number of objects added to the cache)
+        """
+        api = self._api
+        cache = api.name_cache
+        if cache is None:
+            from . import TelerivetException
+            raise TelerivetException("The API handle does not have a name cache")
+
+        from .apicursor import APICursor
+
+        collections = []
+        if groups:
+            collections.append("/groups")
+        if labels:
+            collections.append("/labels")
+        if data_tables:
+            collections.append("/tables")
+
+        num_cached = 0
+        for collection in collections:
+            path = self.getBaseApiPath() + collection
+            for item in APICursor(api, None, path, {'page_size': 500}).raw():
+                cache.put(path, item['name'], item, api.json_codec)
+                num_cached += 1
+        return num_cached
+
+    def getOrCreateByName(self, collection, name):
+        api = self._api
+        path = self.getBaseApiPath() + collection
+
+        cache = api.name_cache
+        if cache is None:
+            return api.doRequest("POST", path, {'name': name})
+
+        res = cache.get(path, name, api.json_codec)
+        if res is None:
+            res = api.doRequest("POST", path, {'name': name})
+            cache.put(path, name, res, api.json_codec)
+        return res
+
     def getBaseApiPath(self):
         return "/projects/%(id)s" % {'id': self.id} 
@@ -0,0 +1,97 @@
+import re
+import threading
+import time
+
+try:
+    _monotonic = time.monotonic
+except AttributeError: # Python 2
+    _monotonic = time.time
+
+class RateLimiter(object):
+    """
+    Limits the rate of API requests sent by a client handle using a token bucket, so that
+    requests are delayed on the client instead of exceeding Telerivet's API rate limits.
+
+    A RateLimiter may be shared by multiple API or AsyncAPI handles, and
+    by any number of threads and asyncio tasks. Requests are delayed in the order in which they
+    are sent.
+
+    Example:
+
+        limiter = telerivet.RateLimiter(10, burst = 20, endpoints = {
+            r'/send_multi$': 2,
+        })
+        tr = telerivet.API(API_KEY, rate_limiter = limiter)
+
+    Arguments:
+      - rate (float)
+          * Maximum average number of requests per second
+          * Required
+
+      - burst (int)
+          * Maximum number of requests that may be sent at once without waiting, after the client
+              has been idle
+          * Default: same as rate (minimum 1)
+
+      - endpoints (dict)
+          * Additional rate limits for particular API endpoints. Each key is a regular expression
+              matched against the request path (e.g. '/messages/send$'), and each value is a
+              RateLimiter or a maximum number of requests per second. Requests that match an
+              endpoint's pattern are subject to both the endpoint's rate limit and the overall
+              rate limit.
+    """
+
+    def __init__(self, rate, burst = None, endpoints = None):
+        if burst is None:
+            burst = max(1, rate)
+
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.endpoints = []
+
+        if endpoints is not None:
+            for pattern, limiter in endpoints.items():
+                if not isinstance(limiter, RateLimiter):
+                    limiter = RateLimiter(limiter)
+                self.endpoints.append((re.compile(pattern), limiter))
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._last_time = _monotonic()
+
+    def reserve(self, method = None, path = None):
+        """
+        Reserves capacity for one request, and returns the number of seconds that the caller must
+        wait before sending the request.
+
+        Returns:
+            float
+        """
+        delay = self.reserveToken()
+
+        if path is not None:
+            for pattern, limiter in self.endpoints:
+                if pattern.search(path):
+                    delay = max(delay, limiter.reserve(method, path))
+
+        return delay
+
+    def reserveToken(self):
+        with self._lock:
+            now = _monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_time) * self.rate)
+            self._last_time = now
+
+            # tokens may become negative, so that later requests wait for earlier ones
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def wait(self, method = None, path = None):
+        """
+        Blocks the current thread until a request may be sent.
+        """
+        delay = self.reserve(method, path)
+        if delay > 0:
+            time.sleep(delay)
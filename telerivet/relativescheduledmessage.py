@@ -163,6 +163,8 @@ class RelativeScheduledMessage(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def save(self):
         """
         Saves any fields or custom variables that have changed for this relative scheduled message.
@@ -0,0 +1,183 @@
+import hashlib
+import re
+import threading
+import time
+
+class CachedResponse(object):
+    __slots__ = ('key', 'content', 'etag', 'last_modified', 'is_fresh')
+
+    def __init__(self, key, content = None, etag = None, last_modified = None, is_fresh = False):
+        self.key = key
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.is_fresh = is_fresh
+
+    def getValidatorHeaders(self):
+        headers = {}
+        if self.content is not None:
+            if self.etag is not None:
+                headers['If-None-Match'] = self.etag
+            if self.last_modified is not None:
+                headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache(object):
+    """
+    Saves API responses for endpoints that return slow-changing metadata (such as contact
+    fields, message fields, data table fields, project users, service configuration, and
+    routes) in a SQLite database file, so that they can be reused by later API requests,
+    including requests made by other processes using the same file.
+
+    Responses are reused without sending a request until they are older
+    than `ttl` seconds. After that, if the saved response had an ETag or Last-Modified header,
+    the request is sent with If-None-Match / If-Modified-Since headers, and the saved response
+    is reused if the server responds with HTTP 304 Not Modified.
+
+    Saved responses for an endpoint are removed when a POST, PUT or DELETE
+    request to that endpoint (e.g. `Service.setConfig`) is sent through an API handle using the
+    cache. Responses are saved separately for each API key and API URL.
+
+    Example:
+
+        tr = telerivet.API(API_KEY, response_cache = telerivet.ResponseCache('/var/cache/myjob/telerivet.db'))
+
+    Arguments:
+      - path
+          * Path of the SQLite database file, or ':memory:' to cache responses only in memory
+          * Required
+
+      - ttl (float)
+          * Number of seconds that saved responses are reused without sending a request
+          * Default: 3600
+
+      - endpoints (array)
+          * Regular expressions matched against the path of GET requests; only responses for
+              matching paths are saved
+          * Default: ResponseCache.DEFAULT_ENDPOINTS
+    """
+
+    DEFAULT_ENDPOINTS = (
+        r'^/projects/[^/]+/contact_fields$',
+        r'^/projects/[^/]+/message_fields$',
+        r'^/projects/[^/]+/tables/[^/]+/fields$',
+        r'^/projects/[^/]+/users$',
+        r'^/projects/[^/]+/services/[^/]+/config$',
+        r'^/projects/[^/]+/routes$',
+    )
+
+    def __init__(self, path, ttl = 3600, endpoints = None):
+        import sqlite3
+
+        self.path = path
+        self.ttl = ttl
+        self.endpoints = [re.compile(pattern) for pattern in (endpoints if endpoints is not None else ResponseCache.DEFAULT_ENDPOINTS)]
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread = False, timeout = 30)
+        self._db.execute("""CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            content BLOB NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            time_updated REAL NOT NULL
+        )""")
+        self._db.commit()
+
+    def isCacheable(self, method, path):
+        if method != 'GET':
+            return False
+
+        for pattern in self.endpoints:
+            if pattern.search(path):
+                return True
+        return False
+
+    def getKey(self, api, path, params):
+        query = sorted(api.getUrlParams(params).items())
+        namespace = hashlib.sha1(("%s %s" % (api.api_key, api.api_url)).encode('utf-8')).hexdigest()
+        return "%s %s %s" % (namespace, path, query)
+
+    def get(self, key):
+        """
+        Returns a CachedResponse containing the saved response for the given key (if any), and
+        whether it can be reused without sending a request.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT content, etag, last_modified, time_updated FROM responses WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return CachedResponse(key)
+
+            content, etag, last_modified, time_updated = row
+            is_fresh = time_updated + self.ttl > time.time()
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return CachedResponse(key, bytes(content), etag, last_modified, is_fresh)
+
+    def put(self, key, path, content, etag = None, last_modified = None):
+        import sqlite3
+
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses (key, path, content, etag, last_modified, time_updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, path, sqlite3.Binary(content), etag, last_modified, time.time()))
+            self._db.commit()
+
+    def touch(self, key):
+        """
+        Marks a saved response as fresh after the server indicated that it has not changed.
+        """
+        with self._lock:
+            self.revalidations += 1
+            self._db.execute("UPDATE responses SET time_updated = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+
+    def invalidate(self, path):
+        """
+        Removes saved responses for the given path and the paths it is contained in, e.g.
+        a request to '/projects/PJ123/contact_fields/name' removes the saved response for
+        '/projects/PJ123/contact_fields'.
+        """
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE path = substr(?, 1, length(path))", (path,))
+            if cursor.rowcount:
+                self._db.commit()
+
+    def clear(self):
+        """
+        Removes all saved responses.
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        """
+        Closes the database file.
+        """
+        with self._lock:
+            self._db.close()
+
+    def asDict(self):
+        """
+        Returns the number of saved responses and the number of hits, misses and revalidated
+        responses.
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                'size': size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+            }
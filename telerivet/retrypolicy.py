@@ -0,0 +1,150 @@
+import random
+import re
+
+from . import APIException
+
+class RetryPolicy(object):
+    """
+    Determines when failed API requests are automatically retried, and how long to wait before
+    each retry.
+
+    Requests are retried after network errors, timeouts, HTTP 5xx responses
+    that are not valid API responses, and responses with a status code in `retry_statuses`
+    (such as 429 Too Many Requests). Errors returned by the API for invalid requests are never
+    retried.
+
+    By default, only requests using idempotent HTTP methods (GET, PUT,
+    DELETE) are retried. Since retrying a POST request after a network error may repeat an
+    action that already succeeded (e.g. sending a message twice), other POST requests are only
+    retried if the request is known not to have been processed (the connection to the server
+    could not be established, or the server responded with HTTP 429), or if their path matches
+    one of the `retry_paths` patterns.
+
+    The delay before each retry increases exponentially from `backoff` up
+    to `max_backoff` seconds, with random jitter so that many clients do not retry at the same
+    time. If the API response has a Retry-After header, the client waits at least that long.
+
+    Example:
+
+        tr = telerivet.API(API_KEY, retry_policy = telerivet.RetryPolicy(
+            max_attempts = 5,
+            retry_paths = [r'/import_contacts$']
+        ))
+
+    Arguments:
+      - max_attempts (int)
+          * Maximum number of times to send each request, including the first attempt
+          * Default: 3
+
+      - backoff (float)
+          * Delay in seconds before the first retry (before jitter)
+          * Default: 0.5
+
+      - max_backoff (float)
+          * Maximum delay in seconds before any retry (before jitter)
+          * Default: 30
+
+      - jitter (bool)
+          * If true, each delay is chosen randomly between zero and the exponential backoff
+              delay
+          * Default: true
+
+      - retry_methods (array)
+          * HTTP methods that are retried
+          * Default: ['GET', 'PUT', 'DELETE']
+
+      - retry_paths (array)
+          * Regular expressions matched against the request path; requests with other HTTP
+              methods (i.e. POST) are retried if their path matches any of the patterns
+
+      - retry_statuses (array)
+          * HTTP status codes that are retried even if the response is a valid API error
+          * Default: [429, 503]
+    """
+
+    def __init__(self, max_attempts = 3, backoff = 0.5, max_backoff = 30, jitter = True,
+            retry_methods = ('GET', 'PUT', 'DELETE'), retry_paths = (), retry_statuses = (429, 503)):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_methods = frozenset(retry_methods)
+        self.retry_paths = [re.compile(pattern) for pattern in retry_paths]
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def isRetryable(self, method, path):
+        """
+        Returns true if a request with the given method and path may be retried.
+
+        Returns:
+            bool
+        """
+        if method in self.retry_methods:
+            return True
+
+        for pattern in self.retry_paths:
+            if pattern.search(path):
+                return True
+
+        return False
+
+    def getRetryDelay(self, method, path, attempt, error, status_code = None, retry_after = None, unprocessed = False):
+        """
+        Returns the number of seconds to wait before retrying a request that failed with the
+        given error, or None if the request should not be retried.
+
+        Arguments:
+          - method
+              * HTTP method of the request
+          - path
+              * Path of the request
+          - attempt (int)
+              * Number of times the request has been sent so far
+          - error
+              * Exception raised by the failed attempt
+          - status_code (int)
+              * HTTP status code of the response, or None if no response was received
+          - retry_after
+              * Value of the Retry-After header of the response, if any
+          - unprocessed (bool)
+              * True if the request is known not to have been processed by the server
+
+        Returns:
+            float
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        if not unprocessed and not self.isRetryable(method, path):
+            return None
+
+        if status_code not in self.retry_statuses:
+            if isinstance(error, APIException):
+                return None
+            if status_code is not None and status_code < 500:
+                return None
+
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        retry_after_sec = self.parseRetryAfter(retry_after)
+        if retry_after_sec is not None:
+            delay = max(delay, retry_after_sec)
+
+        return delay
+
+    def parseRetryAfter(self, retry_after):
+        if retry_after is None:
+            return None
+
+        try:
+            return max(0, float(retry_after))
+        except ValueError:
+            pass
+
+        import email.utils, time
+        parsed = email.utils.parsedate_tz(retry_after)
+        if parsed is None:
+            return None
+        return max(0, email.utils.mktime_tz(parsed) - time.time())
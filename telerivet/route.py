@@ -37,6 +37,8 @@ class Route(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def save(self):
         """
         Saves any fields or custom variables that have changed for this custom route.
@@ -172,6 +172,8 @@ class ScheduledMessage(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def save(self):
         """
         Saves any fields or custom variables that have changed for this scheduled message.
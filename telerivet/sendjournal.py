@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+
+from . import DuplicateSendException
+
+class SendJournal(object):
+    """
+    Records the outcome of API requests that send messages, identified by their idempotency key,
+    so that the same send request is never repeated.
+
+    When an API handle has a send journal, sending with an idempotency key
+    that has already completed returns the saved API response instead of sending the messages
+    again. If a previous request with the same key failed in a way that the messages may or may
+    not have been sent (for example, a timeout after the request was sent), or if the request is
+    still in progress, DuplicateSendException is raised instead.
+
+    If a file path is provided, the journal is saved to that file, so that
+    a job that restarts after a crash does not resend batches that were sent before the crash.
+    Requests that were in progress when the process stopped are treated as having an unknown
+    outcome.
+
+    Example:
+
+        tr = telerivet.API(API_KEY, send_journal = telerivet.SendJournal('/var/lib/myjob/sends.log'))
+
+        project.sendMulti(messages = batch, idempotency_key = 'campaign-42-batch-17')
+
+    Arguments:
+      - path
+          * Path of a file used to save the journal (optional)
+    """
+
+    PENDING = 'pending'
+    DONE = 'done'
+    UNKNOWN = 'unknown'
+    ABORTED = 'aborted'
+
+    def __init__(self, path = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._file = None
+
+        if path is not None:
+            if os.path.exists(path):
+                self.loadFile(path)
+            self._file = open(path, 'a')
+
+    def loadFile(self, path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                record = json.loads(line)
+                key = record['key']
+                state = record['state']
+
+                if state == SendJournal.ABORTED:
+                    self._entries.pop(key, None)
+                elif state == SendJournal.PENDING:
+                    self._entries[key] = (SendJournal.UNKNOWN, None)
+                else:
+                    response = record.get('response')
+                    self._entries[key] = (state, json.dumps(response).encode('utf-8') if response is not None else None)
+
+    def begin(self, key, codec):
+        """
+        Marks a request as in progress. Returns a copy of the saved API response if a request with
+        the same key has already completed, or None if the request should be sent.
+
+        Returns:
+            (associative array)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.setEntry(key, SendJournal.PENDING)
+                return None
+
+            state, content = entry
+
+        if state == SendJournal.DONE:
+            return codec.decode(content)
+        elif state == SendJournal.PENDING:
+            raise DuplicateSendException("A request with idempotency key '%s' is already in progress" % key, key)
+        else:
+            raise DuplicateSendException("A previous request with idempotency key '%s' failed, and may or may not have been processed" % key, key)
+
+    def complete(self, key, response, codec):
+        """
+        Saves a copy of the API response for a request that completed successfully, so that
+        modifying the response does not modify the journal.
+        """
+        content = codec.encode(response)
+        with self._lock:
+            self.setEntry(key, SendJournal.DONE, response, content)
+
+    def abort(self, key, processed):
+        """
+        Records that a request failed. If the request may have been processed by the server,
+        later requests with the same key will raise DuplicateSendException until forget() is
+        called; otherwise the request may be sent again.
+        """
+        with self._lock:
+            self.setEntry(key, SendJournal.UNKNOWN if processed else SendJournal.ABORTED)
+
+    def forget(self, key):
+        """
+        Removes a key from the journal, e.g. after verifying whether a request with an unknown
+        outcome was processed, so that the request can be sent again.
+        """
+        with self._lock:
+            self.setEntry(key, SendJournal.ABORTED)
+
+    def getState(self, key):
+        """
+        Returns the state of the request with the given key ('pending', 'done', or 'unknown'), or
+        None if the key is not in the journal.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def setEntry(self, key, state, response = None, content = None):
+        if state == SendJournal.ABORTED:
+            self._entries.pop(key, None)
+        else:
+            self._entries[key] = (state, content)
+
+        if self._file is not None:
+            record = {'key': key, 'state': state}
+            if response is not None:
+                record['response'] = response
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+    def close(self):
+        """
+        Closes the journal file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
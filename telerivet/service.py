@@ -104,6 +104,8 @@ class Service(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def invoke(self, **options):
         """
         Manually invoke this service in a particular context.
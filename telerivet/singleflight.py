@@ -0,0 +1,90 @@
+import threading
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'content', 'error', 'num_waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.content = None
+        self.error = None
+        self.num_waiters = 0
+
+class SingleFlight(object):
+    """
+    Coalesces identical API requests made concurrently by multiple threads, so that only one
+    request is sent, and all threads receive its result (or exception).
+
+    Used by telerivet.API for GET requests when the `coalesce_requests`
+    option is enabled. Each waiting thread receives its own copy of the response, so entities
+    created from it can be modified independently. Threads waiting for a request sent by another
+    thread are not limited by their own timeouts.
+    """
+
+    def __init__(self, codec):
+        self.codec = codec
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args):
+        """
+        Returns the result of calling func(*args), unless a call with the same key is already in
+        progress on another thread, in which case waits for that call and returns a copy of its
+        result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.requests += 1
+                is_leader = True
+            else:
+                call.num_waiters += 1
+                self.coalesced += 1
+                is_leader = False
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self.codec.decode(call.content)
+
+        try:
+            call.result = func(*args)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                num_waiters = call.num_waiters
+
+            # no more threads can start waiting after the call is removed, so the result only
+            # needs to be copied if some threads are already waiting
+            if num_waiters > 0 and call.error is None:
+                if call.result is None:
+                    # interrupted by an exception not derived from Exception, e.g. KeyboardInterrupt
+                    from . import TelerivetException
+                    call.error = TelerivetException("The API request was interrupted")
+                else:
+                    call.content = self.codec.encode(call.result)
+
+            call.done.set()
+
+        return call.result
+
+    def asDict(self):
+        """
+        Returns the number of requests sent, and the number of requests that waited for an
+        identical request instead of being sent.
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+            }
@@ -81,6 +81,8 @@ class Task(Entity):
           * Read-only
     """
 
+    __slots__ = ()
+
     def cancel(self):
         """
         Cancels a task that is not yet complete.
@@ -0,0 +1,108 @@
+import contextlib
+import sys
+
+# methods that send requests on behalf of other methods, which are not used as operation names
+_INTERNAL_METHODS = frozenset(['doRequest', 'sendApiRequest', 'doStreamingRequest', 'newApiCursor', 'fireHook', 'startRequest', 'recordRequest', '__init__', '__getattr__'])
+
+def getOperationName(frame):
+    """
+    Returns the name of the client method (e.g. 'Project.queryMessages') that is running in
+    the given stack frame or one of its callers, or None if the frame was not called by a
+    client method.
+    """
+    from . import API
+    from .entity import Entity
+
+    while frame is not None and frame.f_globals.get('__name__', '').startswith('telerivet'):
+        code = frame.f_code
+        if code.co_argcount > 0 and code.co_varnames[0] == 'self' and code.co_name not in _INTERNAL_METHODS:
+            obj = frame.f_locals.get('self')
+            if isinstance(obj, (API, Entity)):
+                return '%s.%s' % (type(obj).__name__, code.co_name)
+        frame = frame.f_back
+    return None
+
+def getProjectId(path):
+    parts = path.split('/', 3)
+    if len(parts) > 2 and parts[1] == 'projects':
+        return parts[2]
+    return None
+
+class Tracing(object):
+    """
+    Creates OpenTelemetry spans for API requests and pages of results fetched by API cursors.
+
+    Enable tracing by passing `tracer = True` (to use the global tracer
+    provider) or an opentelemetry Tracer to telerivet.API. Requires the opentelemetry-api
+    module (`pip install telerivet[tracing]`).
+
+    Each request attempt creates a client span named after the client
+    method that sent it (e.g. 'Project.sendMessage'), or the HTTP method and endpoint if the
+    request was not sent by a client method. Each page fetched by an APICursor creates a span
+    named after the query method and page number (e.g. 'Project.queryMessages page 3'),
+    containing the spans of its requests.
+    """
+
+    def __init__(self, tracer = True):
+        from opentelemetry import trace
+
+        if tracer is True:
+            from . import API
+            tracer = trace.get_tracer('telerivet', API.client_version)
+
+        self.tracer = tracer
+        self._trace = trace
+
+    def startRequestSpan(self, info):
+        attributes = {
+            'http.request.method': info['method'],
+            'telerivet.endpoint': info['endpoint'],
+            'telerivet.retry_count': info['attempt'] - 1,
+        }
+        if info['attempt'] > 1:
+            attributes['http.request.resend_count'] = info['attempt'] - 1
+
+        project_id = getProjectId(info['path'])
+        if project_id is not None:
+            attributes['telerivet.project_id'] = project_id
+
+        name = getOperationName(sys._getframe(1)) or '%s %s' % (info['method'], info['endpoint'])
+        info['span'] = self.tracer.start_span(name, kind = self._trace.SpanKind.CLIENT, attributes = attributes)
+
+    def endRequestSpan(self, info):
+        span = info.pop('span', None)
+        if span is None:
+            return
+
+        if info['status_code'] is not None:
+            span.set_attribute('http.response.status_code', info['status_code'])
+
+        error = info.get('error')
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+            span.set_attribute('telerivet.will_retry', info['will_retry'])
+
+        span.end()
+
+    @contextlib.contextmanager
+    def pageSpan(self, cursor, page_number):
+        name = '%s page %d' % (cursor._operation or 'GET %s' % cursor.path, page_number)
+
+        attributes = {'telerivet.page_number': page_number}
+
+        project_id = getProjectId(cursor.path)
+        if project_id is not None:
+            attributes['telerivet.project_id'] = project_id
+
+        page_size = cursor.getPageParams(None).get('page_size')
+        if page_size is not None:
+            attributes['telerivet.page_size'] = page_size
+
+        with self.tracer.start_as_current_span(name, attributes = attributes) as span:
+            yield span
+
+            # the number of items in a streaming page is not known until it has been read
+            if not cursor._stream:
+                span.set_attribute('telerivet.item_count', len(cursor.data))
+                span.set_attribute('telerivet.truncated', bool(cursor.truncated))
@@ -0,0 +1,78 @@
+import threading
+import unittest
+
+import requests
+
+import telerivet
+
+NUM_THREADS = 16
+REQUESTS_PER_THREAD = 50
+
+class FakeAdapter(requests.adapters.HTTPAdapter):
+    # returns a contact for every request without opening a connection
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"id": "CT123", "project_id": "PJ123", "name": "Test"}'
+        response.headers['Content-Type'] = 'application/json'
+        response.request = request
+        response.url = request.url
+        return response
+
+class CountingAPI(telerivet.API):
+    def __init__(self, *args, **kwargs):
+        self.sessions_created = 0
+        self._count_lock = threading.Lock()
+        telerivet.API.__init__(self, *args, **kwargs)
+
+    def createSession(self):
+        with self._count_lock:
+            self.sessions_created += 1
+        return telerivet.API.createSession(self)
+
+class ThreadSafetyTest(unittest.TestCase):
+
+    def runThreads(self, api):
+        start = threading.Event()
+        sessions = []
+        errors = []
+
+        def worker():
+            start.wait()
+            try:
+                project = api.initProjectById('PJ123')
+                for i in range(REQUESTS_PER_THREAD):
+                    project.getContactById('CT123')
+                sessions.append(api.getSession())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target = worker) for i in range(NUM_THREADS)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return sessions
+
+    def testSharedSession(self):
+        api = CountingAPI('key', 'https://api.example.com/v1', adapter = FakeAdapter())
+        sessions = self.runThreads(api)
+
+        self.assertEqual(api.num_requests, NUM_THREADS * REQUESTS_PER_THREAD)
+        self.assertEqual(api.sessions_created, 1)
+        self.assertEqual(len(set(id(session) for session in sessions)), 1)
+
+    def testSessionPerThread(self):
+        api = CountingAPI('key', 'https://api.example.com/v1', adapter = FakeAdapter(), session_per_thread = True)
+        sessions = self.runThreads(api)
+
+        self.assertEqual(api.num_requests, NUM_THREADS * REQUESTS_PER_THREAD)
+        self.assertEqual(api.sessions_created, NUM_THREADS)
+        self.assertEqual(len(set(id(session) for session in sessions)), NUM_THREADS)
+
+if __name__ == '__main__':
+    unittest.main()